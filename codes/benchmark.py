@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:15:47 2026
+
+@author: nehabinish
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import time
+
+import numpy as np
+import numba
+
+import kuramoto_alpha
+import kuramoto_modified
+
+
+'''
+Benchmark of the integrators (Euler, RK2, RK4) and of the coupling kernels of 
+kuramoto_alpha and kuramoto_modified over a grid of N, M and number of steps.
+For every (integrator, kernel) pair the first call, on a 2-step problem, 
+measures the Numba compilation time; every point of the grid is then timed 
+`repeat` times with the compiled code and the best time gives the 
+steady-state throughput in oscillator-steps per second. The results are saved 
+as JSON and two result files can be compared to catch regressions:
+
+    python benchmark.py run --N 100 1000 --M 6 --steps 100 --output new.json
+    python benchmark.py compare old.json new.json
+
+Kernels:
+    dense   : kuramoto_alpha.kuramoto (N x N x M loop)
+    sparse  : kuramoto_alpha.kuramoto_sparse (neighbour list)
+    sparse_parallel: kuramoto_alpha.kuramoto_sparse_parallel (on all cores)
+    global  : kuramoto_alpha.kuramoto_global (mean field, all-to-all)
+    fft     : kuramoto_alpha.kuramoto_fft (nonlocal ring kernel)
+    modified: kuramoto_modified.kuramoto (delays read from the full history)
+    modified_dense: kuramoto_modified.kuramoto_dense (dense K and alpha, BLAS)
+    delay   : kuramoto_modified.kuramoto_delay (ring buffer of the delays)
+    delay_parallel: kuramoto_modified.kuramoto_delay_parallel (on all cores)
+
+'''
+
+INTEGRATORS = ('Euler','RK2','RK4')
+KERNELS = ('dense','sparse','sparse_parallel','global','fft','modified','modified_dense','delay','delay_parallel')
+
+# Kernels with N x N inputs (coupling, delay or dephasing matrices)
+DENSE_KERNELS = ('dense','modified','modified_dense','delay','delay_parallel')
+
+
+# FUNCTION TO BUILD A CALLABLE RUNNING ONE CONFIGURATION
+def setup(integrator,kernel,N,M,steps,seed=0):
+    
+    '''
+    Builds the inputs of one configuration and returns a function running it.
+    The inputs are built once, outside of the timed call, and the phases are 
+    copied at every call so that every repetition does the same work.
+    
+    Parameters
+    ----------
+    integrator: 'Euler', 'RK2' or 'RK4'
+    kernel: One of KERNELS
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    steps: Number of integration steps
+    seed: Seed of the random initial conditions
+    
+    Returns
+    -------
+    run: Function without arguments running the integration
+    
+    '''
+    
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0,0.01*steps,steps+1)
+    w = rng.uniform(-1,1,N)
+    kappa = 2.0
+    theta = np.zeros((N,len(t)))
+    theta[:,0] = rng.uniform(0,2*np.pi,N)
+    
+    if kernel in ('dense','sparse','sparse_parallel','global','fft'):
+        integrate = getattr(kuramoto_alpha,integrator)
+        if kernel == 'dense':
+            f,args = kuramoto_alpha.kuramoto,()
+        elif kernel == 'sparse':
+            f,args = kuramoto_alpha.kuramoto_sparse,kuramoto_alpha.neighbour_list(N,M)
+        elif kernel == 'sparse_parallel':
+            f,args = kuramoto_alpha.kuramoto_sparse_parallel,kuramoto_alpha.neighbour_list(N,M)
+        elif kernel == 'global':
+            f,args = kuramoto_alpha.kuramoto_global,(0.0,)
+        else:
+            f,args = kuramoto_alpha.kuramoto_fft,(kuramoto_alpha.ring_kernel(N,'exponential',M),0.0)
+        return lambda: integrate(f,t,theta.copy(),N,M,w,kappa,args)
+    
+    if kernel not in KERNELS:
+        raise ValueError("unknown kernel '{}'".format(kernel))
+    
+    K = np.zeros((N,N))
+    tau = rng.integers(0,7,size=(N,N))
+    alpha = rng.uniform(0,2*np.pi,size=(N,N))
+    noise = np.zeros((N,len(t))) if kernel in ('modified','modified_dense') else None
+    
+    if kernel == 'modified':
+        integrate = getattr(kuramoto_modified,integrator)
+        return lambda: integrate(kuramoto_modified.kuramoto,theta.copy(),N,t,w,kappa,M,noise,K,tau,alpha)
+    
+    if kernel == 'modified_dense':
+        integrate = getattr(kuramoto_modified,integrator)
+        P = kuramoto_modified.dense_coupling(K,alpha)
+        return lambda: integrate(kuramoto_modified.kuramoto_dense,theta.copy(),N,t,w,kappa,M,noise,P,tau,alpha)
+    
+    if kernel in ('delay','delay_parallel'):
+        integrate = getattr(kuramoto_modified,integrator+'_delay')
+        f = kuramoto_modified.kuramoto_delay if kernel == 'delay' else kuramoto_modified.kuramoto_delay_parallel
+        def run():
+            history,head = kuramoto_modified.delay_buffer(theta[:,0],tau)
+            return integrate(f,history,head,0,steps,N,t,w,kappa,M,noise,K,tau,alpha)
+        return run
+
+
+
+# FUNCTION TO TIME A CALL
+def timed(run,repeat=1):
+    
+    best = np.inf
+    for r in range(0,repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best,time.perf_counter()-start)
+        
+    return best
+
+
+
+# FUNCTION TO RUN THE BENCHMARK
+def benchmark(Ns,Ms,steps,integrators=INTEGRATORS,kernels=KERNELS,repeat=3,dense_max=2000,output=None):
+    
+    '''
+    Times every configuration of the grid.
+    
+    Parameters
+    ----------
+    Ns: Iterable of numbers of oscillators
+    Ms: Iterable of numbers of neighbouring oscillators
+    steps: Iterable of numbers of integration steps
+    integrators: Integrators to time
+    kernels: Kernels to time
+    repeat: Number of timed repetitions, the best one is kept
+    dense_max: Largest N for the kernels of DENSE_KERNELS, which take O(N^2) memory
+    output: Optional path of the JSON file of the results
+    
+    Returns
+    -------
+    results: Dictionary with the environment ('meta'), the compilation times 
+             ('compile') and one entry per configuration ('results')
+    
+    '''
+    
+    compile_times = []
+    results = []
+    
+    for integrator,kernel in itertools.product(integrators,kernels):
+        seconds = timed(setup(integrator,kernel,8,2,2))
+        compile_times.append({'integrator':integrator,'kernel':kernel,'seconds':seconds})
+        
+        for N,M,step in itertools.product(Ns,Ms,steps):
+            if kernel in DENSE_KERNELS and N > dense_max:
+                continue
+            seconds = timed(setup(integrator,kernel,N,M,step),repeat)
+            results.append({'integrator':integrator,'kernel':kernel,'N':N,'M':M,'steps':step,
+                            'seconds':seconds,'throughput':N*step/seconds})
+            
+    report = {'meta':{'date':datetime.datetime.now().isoformat(timespec='seconds'),
+                      'python':platform.python_version(),'numpy':np.__version__,
+                      'numba':numba.__version__,'machine':platform.machine(),
+                      'processor':platform.processor(),'repeat':repeat},
+              'compile':compile_times,'results':results}
+    
+    if output is not None:
+        with open(output,'w') as file:
+            json.dump(report,file,indent=2)
+            
+    return report
+
+
+
+# FUNCTION TO COMPARE TWO BENCHMARKS
+def compare(old,new,threshold=0.1):
+    
+    '''
+    Compares the throughputs of the configurations present in both reports.
+    
+    Parameters
+    ----------
+    old, new: Reports returned by benchmark, or paths of their JSON files
+    threshold: Relative loss of throughput flagged as a regression
+    
+    Returns
+    -------
+    rows: List of (integrator,kernel,N,M,steps,ratio,regression) where ratio 
+          is the new throughput over the old one
+    
+    '''
+    
+    reports = []
+    for report in (old,new):
+        if isinstance(report,str):
+            with open(report) as file:
+                report = json.load(file)
+        reports.append({(r['integrator'],r['kernel'],r['N'],r['M'],r['steps']):r['throughput']
+                        for r in report['results']})
+        
+    rows = []
+    for key in sorted(set(reports[0]) & set(reports[1])):
+        ratio = reports[1][key]/reports[0][key]
+        rows.append(key+(ratio,ratio < 1-threshold))
+        
+    return rows
+
+
+
+def main():
+    
+    parser = argparse.ArgumentParser(description='Benchmark of the Kuramoto integrators and coupling kernels')
+    commands = parser.add_subparsers(dest='command',required=True)
+    
+    run = commands.add_parser('run',help='time the grid of configurations')
+    run.add_argument('--N',type=int,nargs='+',default=(100,1000,10000))
+    run.add_argument('--M',type=int,nargs='+',default=(6,))
+    run.add_argument('--steps',type=int,nargs='+',default=(100,))
+    run.add_argument('--integrators',nargs='+',choices=INTEGRATORS,default=INTEGRATORS)
+    run.add_argument('--kernels',nargs='+',choices=KERNELS,default=KERNELS)
+    run.add_argument('--repeat',type=int,default=3)
+    run.add_argument('--dense-max',type=int,default=2000,help='largest N for the kernels with N x N inputs')
+    run.add_argument('--output',default='benchmark.json')
+    
+    diff = commands.add_parser('compare',help='compare two result files')
+    diff.add_argument('old')
+    diff.add_argument('new')
+    diff.add_argument('--threshold',type=float,default=0.1)
+    
+    options = parser.parse_args()
+    
+    if options.command == 'run':
+        report = benchmark(options.N,options.M,options.steps,options.integrators,options.kernels,
+                           options.repeat,options.dense_max,options.output)
+        for r in report['compile']:
+            print('compile {integrator:6s}{kernel:16s}{seconds:10.3f} s'.format(**r))
+        for r in report['results']:
+            print('{integrator:6s}{kernel:16s}N={N:<8d}M={M:<4d}steps={steps:<7d}{throughput:12.4g} osc-steps/s'.format(**r))
+    else:
+        regressions = 0
+        for integrator,kernel,N,M,steps,ratio,regression in compare(options.old,options.new,options.threshold):
+            print('{:6s}{:16s}N={:<8d}M={:<4d}steps={:<7d}x{:.3f}{}'.format(integrator,kernel,N,M,steps,ratio,
+                                                                         '  REGRESSION' if regression else ''))
+            regressions += regression
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,9 @@ Created on Sun Nov  8 19:56:56 2020
 
 import numpy as np
 import matplotlib.pyplot as plt
+from numba import jit
+
+import order_parameter
 
 
 #FUNCTION TO PLOT AVERAGE OMEGA VS i
@@ -129,4 +132,223 @@ def chimera(z,t):
     ax.set_zlabel('time');
     ax.view_init(50,60)
     
-  
\ No newline at end of file
+  
+
+
+# STATES OF THE RING RETURNED BY classify
+INCOHERENT = 0
+CHIMERA = 1
+SYNC = 2
+STATES = ('incoherent','chimera','sync')
+
+
+# FUNCTION TO SEGMENT THE RING INTO COHERENT AND INCOHERENT DOMAINS
+# not cached: it inlines order_parameter.local_order_now, and the disk cache
+# of this file would not see the changes of order_parameter.py
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def segment(theta,omega,M,z_min,omega_tol,min_domain):
+    
+    '''
+    Marks every oscillator of the ring as coherent or incoherent for one 
+    snapshot. An oscillator is coherent when its local order parameter over 
+    the 2M+1 neighbourhood (order_parameter.local_order_now) is at least z_min 
+    and its velocity lies on a frequency plateau, i.e. differs from the 
+    velocities of both its neighbours by less than omega_tol. Coherent runs 
+    shorter than min_domain oscillators are counted as incoherent.
+    
+    Parameters:
+        ---------------
+        theta: Phases of the oscillators, NumPy array of length N
+        omega: Velocities of the oscillators, NumPy array of length N
+        M: Number of neighbouring oscillators on each side
+        z_min: Threshold of the local order parameter
+        omega_tol: Tolerance of the frequency plateau
+        min_domain: Minimum number of oscillators of a coherent domain
+        
+    Returns:
+        ---------------
+        coherent: Boolean NumPy array of length N
+        domains: Number of coherent domains on the ring
+        
+    '''
+    
+    N = len(theta)
+    Z = order_parameter.local_order_now(theta,M)
+    coherent = np.zeros(N,dtype=np.bool_)
+    
+    for i in range(0,N):
+        coherent[i] = (Z[i] >= z_min and abs(omega[i]-omega[(i-1)%N]) < omega_tol 
+                       and abs(omega[(i+1)%N]-omega[i]) < omega_tol)
+    
+    if np.all(coherent):
+        return coherent,1
+    
+    # Start at an incoherent oscillator so that no domain wraps around the end
+    start = 0
+    while coherent[start]:
+        start += 1
+        
+    domains = 0
+    length = 0
+    for k in range(1,N+1):
+        i = (start+k)%N
+        if coherent[i]:
+            length += 1
+        elif length > 0:
+            if length < min_domain:
+                for l in range(1,length+1):
+                    coherent[(i-l)%N] = False
+            else:
+                domains += 1
+            length = 0
+            
+    return coherent,domains
+
+
+
+# FUNCTION TO CLASSIFY THE STATE OF THE RING
+def classify(coherent,min_fraction=0.05):
+    
+    '''
+    Classifies a segmented snapshot as SYNC (at most min_fraction of the 
+    oscillators incoherent), INCOHERENT (at most min_fraction coherent) or 
+    CHIMERA (coexisting coherent and incoherent domains).
+    
+    Parameters:
+        ---------------
+        coherent: Boolean NumPy array returned by segment
+        min_fraction: Fraction of oscillators below which a kind of domain 
+                      is ignored
+        
+    Returns:
+        ---------------
+        state: INCOHERENT, CHIMERA or SYNC
+        fraction: Fraction of coherent oscillators
+        
+    '''
+    
+    fraction = np.mean(coherent)
+    if fraction >= 1-min_fraction:
+        return SYNC,fraction
+    if fraction <= min_fraction:
+        return INCOHERENT,fraction
+    return CHIMERA,fraction
+
+
+
+# OBSERVER DETECTING CHIMERA STATES AND THEIR LIFETIME
+class Detector:
+    
+    '''
+    Observer of stream.integrate that segments the ring at every call and 
+    tracks the life of a chimera state: it forms when the ring has been in 
+    the CHIMERA state for `persistence` consecutive samples, and collapses 
+    when it has then been in the SYNC or INCOHERENT state for `persistence` 
+    consecutive samples. The velocities are the mean velocities between two 
+    successive calls, so use an `every` of several steps in stream.integrate.
+    Samples before t_start (the transient) are ignored.
+    
+    Parameters:
+        ---------------
+        M: Number of neighbouring oscillators on each side
+        z_min, omega_tol, min_domain: See segment
+        min_fraction: See classify
+        persistence: Number of consecutive samples needed to change state
+        t_start: Time before which the samples are ignored
+        stop_on_collapse: Stop stream.integrate once the chimera has collapsed
+        
+    Attributes:
+        ---------------
+        t: NumPy array of the observed times
+        state: NumPy array of the state (INCOHERENT, CHIMERA or SYNC) of every sample
+        fraction: NumPy array of the fraction of coherent oscillators
+        domains: NumPy array of the number of coherent domains
+        t_formed: Time at which the chimera formed (None if it never did)
+        t_collapsed: Time at which it collapsed (None if it did not)
+        collapsed_to: State after the collapse (SYNC or INCOHERENT)
+        lifetime: t_collapsed - t_formed (None while the chimera is alive)
+        
+    '''
+    
+    def __init__(self,M,z_min=0.9,omega_tol=0.05,min_domain=None,min_fraction=0.05,
+                 persistence=3,t_start=0.0,stop_on_collapse=False):
+        self.M = M
+        self.stop_on_collapse = stop_on_collapse
+        self.z_min = z_min
+        self.omega_tol = omega_tol
+        self.min_domain = M if min_domain is None else min_domain
+        self.min_fraction = min_fraction
+        self.persistence = persistence
+        self.t_start = t_start
+        self.t_formed = None
+        self.t_collapsed = None
+        self.collapsed_to = None
+        self._last = None
+        self._run = (None,0,None) # current state, number of samples in it, first time
+        self._t = []
+        self._state = []
+        self._fraction = []
+        self._domains = []
+        
+    def __call__(self,n,time,theta):
+        if time < self.t_start:
+            return
+        if self._last is None:
+            self._last = (time,theta.copy())
+            return
+        
+        last_time,last_theta = self._last
+        omega = (theta-last_theta)/(time-last_time)
+        self._last = (time,theta.copy())
+        
+        coherent,domains = segment(theta,omega,self.M,self.z_min,self.omega_tol,self.min_domain)
+        state,fraction = classify(coherent,self.min_fraction)
+        self._t.append(time)
+        self._state.append(state)
+        self._fraction.append(fraction)
+        self._domains.append(domains)
+        
+        current,count,first = self._run
+        if state == current:
+            self._run = (state,count+1,first)
+        else:
+            self._run = (state,1,time)
+        current,count,first = self._run
+        
+        if count == self.persistence:
+            if self.t_formed is None and state == CHIMERA:
+                self.t_formed = first
+            elif self.t_formed is not None and self.t_collapsed is None and state != CHIMERA:
+                self.t_collapsed = first
+                self.collapsed_to = state
+                
+    @property
+    def collapsed(self):
+        return self.t_collapsed is not None
+    
+    @property
+    def done(self):
+        # Ends stream.integrate once the chimera has collapsed
+        return self.stop_on_collapse and self.collapsed
+    
+    @property
+    def lifetime(self):
+        if self.t_formed is None or self.t_collapsed is None:
+            return None
+        return self.t_collapsed-self.t_formed
+    
+    @property
+    def t(self):
+        return np.array(self._t)
+    
+    @property
+    def state(self):
+        return np.array(self._state)
+    
+    @property
+    def fraction(self):
+        return np.array(self._fraction)
+    
+    @property
+    def domains(self):
+        return np.array(self._domains)
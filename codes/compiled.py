@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:30:12 2026
+
+@author: nehabinish
+"""
+
+import sys
+import time
+
+import numpy as np
+from numba import jit, types
+
+import kuramoto_alpha
+import kuramoto_modified
+
+
+'''
+Ahead-of-time typed and cached versions of the integrators.
+
+The integrators of kuramoto_alpha and kuramoto_modified take the right hand 
+side as a first-class function. Numba types such an argument by the identity 
+of the function, so every script recompiles every integrator for every 
+kernel, and these specialisations cannot be cached on disk. Here the 
+integrators are compiled for explicit signatures in which the right hand side 
+is a function type (types.FunctionType): one compilation then serves every 
+kernel with the same signature, and it is cached in __pycache__ (cache=True), 
+so later processes load it in milliseconds instead of compiling it again.
+
+The functions below have the same arguments as their counterparts and are 
+used the same way:
+
+    import compiled
+    theta,omega_k = compiled.RK4(kuramoto_alpha.kuramoto_sparse,t,theta,N,M,w,kappa,
+                                 kuramoto_alpha.neighbour_list(N,M))
+
+A right hand side without a signature in SIGNATURES falls back to the lazy 
+integrator of its module. Running
+
+    python compiled.py
+
+compiles (or loads) everything once; afterwards short jobs start in well 
+under a second.
+
+'''
+
+float1d = types.float64[:]
+float2d = types.float64[:,:]
+int1d = types.int64[:]
+int2d = types.int64[:,:]
+complex1d = types.complex128[:]
+
+# Common arguments of the right hand sides of kuramoto_alpha:
+# theta,time,N,t,M,w,kappa
+ALPHA_ARGS = (float1d,types.float64,types.int64,float1d,types.int64,float1d,types.float64)
+
+# Extra arguments (the args tuple of the integrators) of every kernel
+EXTRA_ARGS = {
+    'kuramoto':(),
+    'kuramoto_sparse':(int1d,int1d,float1d),
+    'kuramoto_sparse_parallel':(int1d,int1d,float1d),
+    'kuramoto_global':(types.float64,),
+    'kuramoto_global_parallel':(types.float64,),
+    'kuramoto_fft':(complex1d,types.float64),
+    }
+
+SIGNATURES = {name:float1d(*(ALPHA_ARGS+extra)) for name,extra in EXTRA_ARGS.items()}
+
+# Signature of kuramoto_modified.kuramoto_delay and kuramoto_delay_parallel:
+# theta_i,time,eta,history,head,N,M,w,kappa,K,tau,alpha
+DELAY_SIGNATURE = float1d(float1d,types.float64,float1d,float2d,types.int64,types.int64,types.int64,
+                          float1d,types.float64,float2d,int2d,float2d)
+
+
+# Arguments of the integrators after the right hand side, for the extra
+# arguments `extra` of the kernel
+def _integrator_args(name,extra):
+    args = types.Tuple(extra)
+    if name in ('Euler','RK2','RK4'):
+        return (float1d,float2d,types.int64,types.int64,float1d,types.float64,args)
+    if name == 'RK4_into':
+        return (float1d,float2d,float2d,types.int64,types.int64,float1d,types.float64,args)
+    if name in ('Euler_steps','RK2_steps','RK4_steps'):
+        return (float1d,float1d,types.int64,types.int64,types.int64,types.int64,float1d,types.float64,args)
+    raise ValueError(name)
+
+
+def _delay_args(name,noise=float2d):
+    if name in ('Euler_Maruyama_delay','Heun_delay'):
+        noise,normals = types.float64,(float2d,)
+    else:
+        normals = ()
+    return (float2d,types.int64,types.int64,types.int64,types.int64,float1d,float1d,types.float64,
+            types.int64,noise,float2d,int2d,float2d)+normals
+
+
+_typed = {}
+
+# FUNCTION RETURNING THE TYPED AND CACHED INTEGRATOR OF A KERNEL
+def typed(name,kernel,no_noise=False):
+    
+    '''
+    Compiles (or loads from the disk cache) the integrator `name` of 
+    kuramoto_alpha (or kuramoto_modified for the _delay integrators) for the 
+    signature of the kernel `kernel`. The result is kept for the process.
+    
+    Parameters
+    ----------
+    name: Name of the integrator, e.g. 'RK4', 'RK4_steps' or 'RK4_delay'
+    kernel: Name of the right hand side, a key of SIGNATURES or of DELAY_KERNELS
+    no_noise: For Euler_delay, RK2_delay and RK4_delay, compile for noise=None 
+              instead of a noise array
+    
+    Returns
+    -------
+    integrator: Numba dispatcher compiled for that signature only
+    
+    '''
+    
+    key = (name,kernel,no_noise)
+    if key not in _typed:
+        if name.endswith('_delay'):
+            module = kuramoto_modified
+            noise = types.none if no_noise else float2d
+            signature = (types.FunctionType(DELAY_SIGNATURE),)+_delay_args(name,noise)
+        else:
+            module = kuramoto_alpha
+            signature = (types.FunctionType(SIGNATURES[kernel]),)+_integrator_args(name,EXTRA_ARGS[kernel])
+        _typed[key] = jit([signature],nopython=True,cache=True)(getattr(module,name).py_func)
+        
+    return _typed[key]
+
+
+def _kernel(f):
+    name = getattr(f,'__name__',None)
+    if getattr(kuramoto_alpha,name,None) is f and name in SIGNATURES:
+        return name
+    return None
+
+
+# INTEGRATORS OF kuramoto_alpha
+def Euler(f,t,theta,N,M,w,kappa,args=()):
+    kernel = _kernel(f)
+    if kernel is None:
+        return kuramoto_alpha.Euler(f,t,theta,N,M,w,kappa,args)
+    return typed('Euler',kernel)(f,t,theta,N,M,w,float(kappa),tuple(args))
+
+
+def RK2(f,t,theta,N,M,w,kappa,args=()):
+    kernel = _kernel(f)
+    if kernel is None:
+        return kuramoto_alpha.RK2(f,t,theta,N,M,w,kappa,args)
+    return typed('RK2',kernel)(f,t,theta,N,M,w,float(kappa),tuple(args))
+
+
+def RK4(f,t,theta,N,M,w,kappa,args=()):
+    kernel = _kernel(f)
+    if kernel is None:
+        return kuramoto_alpha.RK4(f,t,theta,N,M,w,kappa,args)
+    return typed('RK4',kernel)(f,t,theta,N,M,w,float(kappa),tuple(args))
+
+
+def RK4_into(f,t,theta,omega_k,N,M,w,kappa,args=()):
+    kernel = _kernel(f)
+    if kernel is None:
+        return kuramoto_alpha.RK4_into(f,t,theta,omega_k,N,M,w,kappa,args)
+    return typed('RK4_into',kernel)(f,t,theta,omega_k,N,M,w,float(kappa),tuple(args))
+
+
+def Euler_steps(f,t,theta,n0,n1,N,M,w,kappa,args=()):
+    kernel = _kernel(f)
+    if kernel is None:
+        return kuramoto_alpha.Euler_steps(f,t,theta,n0,n1,N,M,w,kappa,args)
+    return typed('Euler_steps',kernel)(f,t,theta,n0,n1,N,M,w,float(kappa),tuple(args))
+
+
+def RK2_steps(f,t,theta,n0,n1,N,M,w,kappa,args=()):
+    kernel = _kernel(f)
+    if kernel is None:
+        return kuramoto_alpha.RK2_steps(f,t,theta,n0,n1,N,M,w,kappa,args)
+    return typed('RK2_steps',kernel)(f,t,theta,n0,n1,N,M,w,float(kappa),tuple(args))
+
+
+def RK4_steps(f,t,theta,n0,n1,N,M,w,kappa,args=()):
+    kernel = _kernel(f)
+    if kernel is None:
+        return kuramoto_alpha.RK4_steps(f,t,theta,n0,n1,N,M,w,kappa,args)
+    return typed('RK4_steps',kernel)(f,t,theta,n0,n1,N,M,w,float(kappa),tuple(args))
+
+
+# INTEGRATORS OF kuramoto_modified WITH THE DELAY BUFFER
+DELAY_KERNELS = ('kuramoto_delay','kuramoto_delay_parallel')
+
+def _delay(name,f,history,head,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha,*normals):
+    kernel = getattr(f,'__name__',None)
+    if kernel not in DELAY_KERNELS or getattr(kuramoto_modified,kernel) is not f:
+        return getattr(kuramoto_modified,name)(f,history,head,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha,*normals)
+    integrator = typed(name,kernel,noise is None)
+    return integrator(f,history,head,n0,n1,N,t,w,float(kappa),M,noise,K,tau,alpha,*normals)
+
+
+def Euler_delay(*args):
+    return _delay('Euler_delay',*args)
+
+
+def RK2_delay(*args):
+    return _delay('RK2_delay',*args)
+
+
+def RK4_delay(*args):
+    return _delay('RK4_delay',*args)
+
+
+def Euler_Maruyama_delay(*args):
+    return _delay('Euler_Maruyama_delay',*args)
+
+
+def Heun_delay(*args):
+    return _delay('Heun_delay',*args)
+
+
+
+# FUNCTION TO COMPILE EVERYTHING IN ADVANCE
+def warmup(verbose=True):
+    
+    '''
+    Compiles, or loads from the disk cache, every typed integrator for every 
+    kernel, as well as the cached analysis kernels, by running them on tiny 
+    problems.
+    
+    Parameters
+    ----------
+    verbose: Print the time spent on every integrator
+    
+    '''
+    
+    import order_parameter
+    import shannon_entropy
+    
+    N,M = 8,2
+    t = np.linspace(0,0.1,3)
+    w = np.zeros(N)
+    theta = np.zeros((N,len(t)))
+    args = {'kuramoto':(),'kuramoto_sparse':kuramoto_alpha.neighbour_list(N,M),
+            'kuramoto_global':(0.0,),'kuramoto_fft':(kuramoto_alpha.ring_kernel(N),0.0)}
+    args['kuramoto_sparse_parallel'] = args['kuramoto_sparse']
+    args['kuramoto_global_parallel'] = args['kuramoto_global']
+    
+    for kernel in SIGNATURES:
+        f = getattr(kuramoto_alpha,kernel)
+        for name in ('Euler','RK2','RK4','RK4_into','Euler_steps','RK2_steps','RK4_steps'):
+            start = time.perf_counter()
+            if name == 'RK4_into':
+                RK4_into(f,t,theta.copy(),np.zeros((N,len(t))),N,M,w,1.0,args[kernel])
+            elif name.endswith('_steps'):
+                globals()[name](f,t,theta[:,0].copy(),0,2,N,M,w,1.0,args[kernel])
+            else:
+                globals()[name](f,t,theta.copy(),N,M,w,1.0,args[kernel])
+            if verbose:
+                print('{:22s}{:18s}{:8.3f} s'.format(name,kernel,time.perf_counter()-start))
+                
+    K = np.zeros((N,N))
+    tau = np.zeros((N,N),dtype=np.int64)
+    alpha = np.zeros((N,N))
+    for kernel in DELAY_KERNELS:
+        f = getattr(kuramoto_modified,kernel)
+        for name in ('Euler_delay','RK2_delay','RK4_delay','Euler_Maruyama_delay','Heun_delay'):
+            start = time.perf_counter()
+            history,head = kuramoto_modified.delay_buffer(np.zeros(N),tau)
+            if name in ('Euler_Maruyama_delay','Heun_delay'):
+                noise,normals = 0.0,(np.zeros((2,N)),)
+            else:
+                noise,normals = None,()
+            globals()[name](f,history,head,0,2,N,t,w,1.0,M,noise,K,tau,alpha,*normals)
+            if verbose:
+                print('{:22s}{:18s}{:8.3f} s'.format(name,kernel,time.perf_counter()-start))
+            
+    order_parameter.order(theta,N,t)
+    order_parameter.local_order(theta,M)
+    shannon_entropy.Shannon_entropy(theta,N,t,M)
+    shannon_entropy.Shannon_entropy(theta,N,t,M,0,False)
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    warmup('-q' not in sys.argv)
+    print('warm-up done in {:.1f} s'.format(time.perf_counter()-start))
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:40:02 2026
+
+@author: nehabinish
+"""
+
+import argparse
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+from numba import jit
+
+import kuramoto_alpha
+
+
+'''
+RK4 integration of a very large ring (or open chain) with one process per
+contiguous segment of the oscillators. The phases, the RK4 stages and the
+slopes live in multiprocessing.shared_memory blocks seen by every worker; a
+worker only writes its own segment [lo,hi) and reads the M-1 oscillators on
+each side of it (its halo) straight from the segments of its neighbours, so
+no halo is ever copied. The workers meet at a barrier once per RK stage,
+after which the stage they have just written is visible to their neighbours.
+Every oscillator is computed with exactly the operations of
+kuramoto_alpha.kuramoto_sparse and kuramoto_alpha.RK4, so the result is the
+serial one bit for bit, whatever the number of workers.
+
+Usage from the command line:
+
+    python domain.py --N 1000000 --M 6 --tf 1 --step 101 --workers 16
+
+'''
+
+
+# FUNCTION TO EVALUATE THE RIGHT HAND SIDE ON A SEGMENT
+# kuramoto_alpha.kuramoto_sparse restricted to the oscillators lo,...,hi-1 and
+# written into k, segment_rhs(k,theta,lo,hi,N,w,kappa,indptr,indices,weights),
+# with the inner loop of kuramoto_sparse itself (kuramoto_alpha.sparse_coupling)
+segment_rhs = kuramoto_alpha.kuramoto_sparse_segment
+
+
+# FUNCTIONS TO COMBINE THE STAGES ON A SEGMENT
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def segment_stage(stage,theta,k,c,lo,hi):
+
+    for i in range(lo,hi):
+        stage[i] = theta[i]+k[i]*c
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def segment_update(theta,k1,k2,k3,k4,delta_t,lo,hi):
+
+    for i in range(lo,hi):
+        theta[i] = theta[i]+(k1[i]+2*k2[i]+2*k3[i]+k4[i])*(delta_t/6)
+'''
+segment_stage writes theta + k*c, the input of the next stage, and
+segment_update the RK4 combination of the four slopes, on lo,...,hi-1 only.
+'''
+
+
+
+# FUNCTIONS TO PUT ARRAYS IN SHARED MEMORY AND TO ATTACH TO THEM
+def _share(array,blocks):
+    block = shared_memory.SharedMemory(create=True,size=max(array.nbytes,1))
+    blocks.append(block)
+    view = np.ndarray(array.shape,dtype=array.dtype,buffer=block.buf)
+    view[...] = array
+    return (block.name,array.shape,array.dtype.str),view
+
+
+def _attach(spec,blocks):
+    name,shape,dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape,dtype=np.dtype(dtype),buffer=block.buf)
+
+
+# FUNCTION RUN BY EVERY WORKER
+def _worker(specs,lo,hi,t,N,kappa,every,barrier):
+
+    blocks = []
+    views = []
+    try:
+        views = [_attach(spec,blocks) for spec in specs]
+        theta,w,indptr,indices,weights,k1,k2,k3,k4,stage_a,stage_b,out = views
+        args = (N,w,kappa,indptr,indices,weights)
+
+        for n in range(0,len(t)-1):
+            delta_t = t[n+1]-t[n]
+            segment_rhs(k1,theta,lo,hi,*args)
+            segment_stage(stage_a,theta,k1,delta_t/2,lo,hi)
+            barrier.wait()
+            segment_rhs(k2,stage_a,lo,hi,*args)
+            segment_stage(stage_b,theta,k2,delta_t/2,lo,hi)
+            barrier.wait()
+            segment_rhs(k3,stage_b,lo,hi,*args)
+            segment_stage(stage_a,theta,k3,delta_t,lo,hi)
+            barrier.wait()
+            segment_rhs(k4,stage_a,lo,hi,*args)
+            segment_update(theta,k1,k2,k3,k4,delta_t,lo,hi)
+            if (n+1)%every == 0:
+                out[lo:hi,(n+1)//every] = theta[lo:hi]
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        # the views must go before the blocks can be closed
+        views = theta = w = indptr = indices = weights = k1 = k2 = k3 = k4 = stage_a = stage_b = out = args = None
+        for block in blocks:
+            block.close()
+
+
+
+# FUNCTION TO INTEGRATE THE RING WITH ONE PROCESS PER SEGMENT
+def RK4(t,theta0,N,M,w,kappa,closed=True,workers=None,every=1,neighbours=None):
+
+    '''
+    RK4 integration split over `workers` processes, each owning a contiguous
+    segment of about N/workers oscillators. Equal to
+
+        kuramoto_alpha.RK4(kuramoto_alpha.kuramoto_sparse,t,theta,N,M,w,kappa,
+                           kuramoto_alpha.neighbour_list(N,M,closed))
+
+    bit for bit, but only the phases every `every` steps are kept.
+
+    Parameters
+    ----------
+    t: Time interval for simulation
+    theta0: Initial values of theta, NumPy array of length N
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    w: Natural frequencies
+    kappa: Coupling value
+    closed: Ring (True) or open chain (False)
+    workers: Number of worker processes (default: all the cores)
+    every: Stride, in steps, of the stored phases
+    neighbours: Optional neighbour list (indptr,indices,weights) replacing
+                the one of the ring; its neighbours should be close to each
+                oscillator for the halos to stay small
+
+    Returns
+    -------
+    theta: NumPy array of shape (N,len(t[::every])) - phases at t[::every]
+
+    See Also
+    -------
+    multiprocessing.shared_memory: Blocks of memory shared between processes
+
+    '''
+
+    if workers is None:
+        workers = os.cpu_count()
+    workers = max(1,min(workers,N))
+    if neighbours is None:
+        neighbours = kuramoto_alpha.neighbour_list(N,M,closed)
+    indptr,indices,weights = neighbours
+
+    T = len(t[::every])
+    blocks = []
+    processes = []
+    try:
+        arrays = [np.asarray(theta0,dtype=np.float64),np.asarray(w,dtype=np.float64),indptr,indices,weights]
+        arrays += [np.zeros(N) for _ in range(6)]
+        specs = []
+        for array in arrays:
+            specs.append(_share(array,blocks)[0])
+        spec,out = _share(np.zeros((N,T)),blocks)
+        specs.append(spec)
+        out[:,0] = theta0
+
+        bounds = np.linspace(0,N,workers+1).astype(np.int64)
+        barrier = multiprocessing.Barrier(workers)
+        processes = [multiprocessing.Process(target=_worker,args=(specs,bounds[p],bounds[p+1],t,N,float(kappa),
+                                                                  every,barrier))
+                     for p in range(0,workers)]
+        for process in processes:
+            process.start()
+        # a worker killed by a signal (or the OOM killer) never reaches the
+        # barrier again, and may have died holding its lock, so that aborting
+        # it could block too: the other workers are terminated instead
+        running = processes
+        while running:
+            multiprocessing.connection.wait([process.sentinel for process in running])
+            running = [process for process in running if process.exitcode is None]
+            if any(process.exitcode not in (None,0) for process in processes):
+                for process in running:
+                    process.terminate()
+        if any(process.exitcode != 0 for process in processes):
+            raise RuntimeError('a worker of the domain decomposition failed (exit codes {})'
+                               .format([process.exitcode for process in processes]))
+
+        theta = out.copy()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        out = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return theta
+
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='RK4 integration of a large ring split over several processes')
+    parser.add_argument('--N',type=int,default=1000000,help='total number of oscillators')
+    parser.add_argument('--M',type=int,default=6,help='number of neighbouring oscillators')
+    parser.add_argument('--kappa',type=float,default=4.0,help='coupling value')
+    parser.add_argument('--tf',type=float,default=1.0,help='end of time interval')
+    parser.add_argument('--step',type=int,default=101,help='total number of values in the time interval')
+    parser.add_argument('--workers',type=int,default=None,help='number of worker processes')
+    parser.add_argument('--seed',type=int,default=0,help='seed of the initial phases and frequencies')
+    options = parser.parse_args()
+
+    rng = np.random.default_rng(options.seed)
+    theta0 = rng.uniform(0,2*np.pi,options.N)
+    w = rng.uniform(-1,1,options.N)
+    t = np.linspace(0,options.tf,options.step)
+
+    start = time.perf_counter()
+    RK4(t,theta0,options.N,options.M,w,options.kappa,workers=options.workers,every=len(t)-1)
+    print('{} oscillators, {} steps in {:.2f} s'.format(options.N,len(t)-1,time.perf_counter()-start))
+
+
+if __name__ == '__main__':
+    main()
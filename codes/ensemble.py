@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:40 2026
+
+@author: nehabinish
+"""
+
+import numpy as np
+from numba import jit
+
+
+'''
+Batched versions of the integrators of kuramoto_alpha. The state carries an
+extra leading axis of B members (theta has shape (B,N,len(t))), every member
+has its own natural frequencies w[b] and coupling kappa[b], and all the
+members are advanced together inside one compiled loop instead of a Python
+loop over runs. Any right hand side of kuramoto_alpha (kuramoto,
+kuramoto_sparse, kuramoto_global, kuramoto_fft) can be used, with the same
+args tuple shared by all the members.
+
+'''
+
+# FUNCTION TO DRAW THE INITIAL CONDITIONS OF AN ENSEMBLE
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def initial_values(B,N,t,seeds):
+    
+    '''
+    Draws the random initial phases and natural frequencies of every member 
+    of the ensemble, as done for a single run in main.py, from its own seed so 
+    that every member can be reproduced on its own.
+
+    Parameters 
+        -------------
+        B: Number of members of the ensemble
+        N: Total number of oscillators.
+        t: Time interval for simulation
+        seeds: NumPy array of B integer seeds
+        
+    Returns 
+        -------------
+        theta: NumPy array of shape (B,N,len(t)) with random initial values 
+               (between 0-2pi) in theta[:,:,0]
+        w: NumPy array of shape (B,N) with natural frequencies between -1 and 1
+
+    '''
+    
+    theta = np.zeros((B,N,len(t)))
+    w = np.zeros((B,N))
+    
+    for b in range(0,B):
+        theta[b,:,0],w[b] = initial_state(N,seeds[b])
+        
+    return theta,w
+
+
+
+# FUNCTION TO DRAW THE INITIAL CONDITIONS OF ONE MEMBER
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def initial_state(N,seed):
+    
+    '''
+    Initial phases and natural frequencies of the member of initial_values 
+    with the given seed, without the (N,len(t)) trajectory array.
+
+    Parameters 
+        -------------
+        N: Total number of oscillators.
+        seed: Integer seed
+        
+    Returns 
+        -------------
+        theta: NumPy array of length N with random initial values (between 0-2pi)
+        w: NumPy array of length N with natural frequencies between -1 and 1
+
+    '''
+    
+    theta = np.zeros(N)
+    w = np.zeros(N)
+    
+    np.random.seed(seed)
+    for i in range(0,N):
+        theta[i] = np.random.uniform(0,2*np.pi)
+    for i in range(0,N):
+        w[i] = np.random.uniform(-1,1)
+        
+    return theta,w
+
+
+
+# FUNCTION FOR NUMERICAL INTEGRATION OF AN ENSEMBLE USING EULER METHOD
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def Euler(f,t,theta,N,M,w,kappa,args=()):
+    
+    '''
+    Euler integration of all the members of the ensemble.
+
+    Parameters 
+        -------------
+        function: kuramoto (any right hand side of kuramoto_alpha)
+        t: Time interval for simulation
+        theta: NumPy array of shape (B,N,len(t)) with the initial values in theta[:,:,0]
+        N: Total number of oscillators.
+        M: Number of neighbouring oscillators
+        w: NumPy array of shape (B,N) with the natural frequencies of every member
+        kappa: NumPy array of shape (B,) with the coupling of every member
+        args: Tuple of extra arguments passed on to the function after kappa
+        
+    Returns 
+        -------------
+        theta: Numpy Array of shape (B,N,len(t)) - Phases of every member at 
+               every point of time.
+
+    '''
+    
+    for n in range(0,len(t)-1):
+        delta_t = t[n+1]-t[n]
+        for b in range(0,theta.shape[0]):
+            theta[b,:,n+1] = theta[b,:,n]+f(theta[b,:,n],t[n],N,t,M,w[b],kappa[b],*args)*delta_t
+            
+    return theta
+
+
+
+# FUNCTION FOR NUMERICAL INTEGRATION OF AN ENSEMBLE USING RK2
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def RK2(f,t,theta,N,M,w,kappa,args=()):
+    
+    '''
+    RK2 (midpoint) integration of all the members of the ensemble.
+
+    Parameters 
+        -------------
+        See Euler.
+        
+    Returns 
+        -------------
+        theta: Numpy Array of shape (B,N,len(t)) - Phases of every member at 
+               every point of time.
+
+    '''
+    
+    for n in range(0,len(t)-1):
+        delta_t = t[n+1]-t[n]
+        for b in range(0,theta.shape[0]):
+            k1 = f(theta[b,:,n],t[n],N,t,M,w[b],kappa[b],*args)
+            k2 = f(theta[b,:,n]+k1*delta_t/2,t[n]+delta_t/2,N,t,M,w[b],kappa[b],*args)
+            theta[b,:,n+1] = theta[b,:,n]+k2*delta_t
+            
+    return theta
+
+
+
+# FUNCTION FOR NUMERICAL INTEGRATION OF AN ENSEMBLE USING RK4
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def RK4(f,t,theta,N,M,w,kappa,args=()):
+    
+    '''
+    RK4 integration of all the members of the ensemble.
+
+    Parameters 
+        -------------
+        See Euler.
+        
+    Returns 
+        -------------
+        theta: Numpy Array of shape (B,N,len(t)) - Phases of every member at 
+               every point of time.
+        omega_k: Numpy Array of shape (B,N,len(t)) - Velocities of the 
+                 oscillators of every member at every given time t
+               
+    See also:
+        -----------------
+        np.zeros: Return a new array of given shape and type, filled with zeros(used for intilisation)
+
+    '''
+    
+    omega_k = np.zeros(theta.shape)
+    
+    for n in range(0,len(t)-1):
+        delta_t = t[n+1]-t[n]
+        for b in range(0,theta.shape[0]):
+            k1 = f(theta[b,:,n],t[n],N,t,M,w[b],kappa[b],*args)
+            omega_k[b,:,n] = k1
+            k2 = f(theta[b,:,n]+k1*delta_t/2,t[n]+delta_t/2,N,t,M,w[b],kappa[b],*args)
+            k3 = f(theta[b,:,n]+k2*delta_t/2,t[n]+delta_t/2,N,t,M,w[b],kappa[b],*args)
+            k4 = f(theta[b,:,n]+k3*delta_t,t[n]+delta_t,N,t,M,w[b],kappa[b],*args)
+            theta[b,:,n+1] = theta[b,:,n]+(k1+2*k2+2*k3+k4)*(delta_t/6)
+            
+    return theta,omega_k
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:25:48 2026
+
+@author: nehabinish
+"""
+
+import json
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import compiled
+import ensemble
+import kuramoto_alpha
+import order_parameter
+
+
+'''
+Ensemble of independent runs spread over a process pool without sending the
+trajectories back through pickles. The result blocks of all the members are
+allocated once by the parent, in shared memory or, when a path is given, as
+memory-mapped .npy files:
+
+    theta   : (B,N,len(t))   phases of every member
+    omega_k : (B,N,len(t))   velocities of every member (as returned by RK4)
+    w       : (B,N)          natural frequencies
+    r, phi  : (B,len(t))     order parameter
+
+Every worker integrates its member with compiled.RK4_into directly into its
+slices of theta and omega_k, writes the other blocks in place and only returns
+the index of the member. The parent gets NumPy views on the same memory, which can be passed
+as they are to order_parameter and chimera:
+
+    with ensemble_pool.run(kappas,seeds,N,M,t,'ring') as results:
+        for b in range(0,len(results.kappa)):
+            chimera.segment(results.theta[b,:,-1],results.omega_k[b,:,-1],M,0.9,0.05,M)
+
+Shared memory is released by close() (or at the end of the with block); a
+run written to a path can be reopened later with load(path).
+
+'''
+
+FIELDS = ('theta','omega_k','w','r','phi')
+
+
+def _shapes(B,N,T):
+    return {'theta':(B,N,T),'omega_k':(B,N,T),'w':(B,N),'r':(B,T),'phi':(B,T)}
+
+
+# FUNCTIONS TO ALLOCATE THE RESULT BLOCKS AND TO OPEN THEM IN THE WORKERS
+def _allocate(shapes,path):
+    blocks = []
+    specs = {}
+    views = {}
+    for name,shape in shapes.items():
+        if path is None:
+            block = shared_memory.SharedMemory(create=True,size=max(int(np.prod(shape))*8,1))
+            blocks.append(block)
+            specs[name] = ('shm',block.name,shape)
+            views[name] = np.ndarray(shape,dtype=float,buffer=block.buf)
+        else:
+            file = os.path.join(path,name+'.npy')
+            specs[name] = ('file',file,shape)
+            views[name] = np.lib.format.open_memmap(file,mode='w+',dtype=float,shape=shape)
+    return specs,views,blocks
+
+
+def _open(spec,blocks):
+    kind,name,shape = spec
+    if kind == 'file':
+        return np.load(name,mmap_mode='r+')
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    return np.ndarray(shape,dtype=float,buffer=block.buf)
+
+
+_views = {}
+_blocks = []
+
+def _init(specs):
+    for name,spec in specs.items():
+        _views[name] = _open(spec,_blocks)
+
+
+
+# FUNCTION RUN BY THE WORKERS FOR ONE MEMBER
+def run_member(job):
+
+    '''
+    Integrates one member of the ensemble with RK4 and writes its phases,
+    velocities, natural frequencies and order parameter in place in the
+    result blocks opened by the worker.
+
+    Parameters
+    ----------
+    job: Tuple (b,kappa,seed,N,M,t,coupling) where
+         b: Index of the member in the result blocks
+         kappa: Coupling value
+         seed: Seed of the initial phases and natural frequencies
+         N: Total number of oscillators.
+         M: Number of neighbouring oscillators
+         t: Time interval for simulation
+         coupling: 'sparse' (open chain), 'ring' (closed ring) or 'global'
+
+    Returns
+    -------
+    b: Index of the member
+
+    '''
+
+    b,kappa,seed,N,M,t,coupling = job
+
+    theta0,w = ensemble.initial_state(N,seed)
+
+    if coupling == 'global':
+        f,args = kuramoto_alpha.kuramoto_global,(0.0,)
+    elif coupling in ('sparse','ring'):
+        f,args = kuramoto_alpha.kuramoto_sparse,kuramoto_alpha.neighbour_list(N,M,coupling=='ring')
+    else:
+        raise ValueError("unknown coupling '{}'".format(coupling))
+
+    theta = _views['theta'][b]
+    theta[:,0] = theta0
+    _views['w'][b] = w
+
+    compiled.RK4_into(f,t,theta,_views['omega_k'][b],N,M,_views['w'][b],kappa,args)
+    _views['r'][b],_views['phi'][b],z = order_parameter.order(theta,N,t)
+
+    return b
+
+
+
+# RESULTS OF AN ENSEMBLE RUN
+class Results:
+
+    '''
+    Views on the result blocks of run or load, with the parameters of every
+    member (kappa[b], seed[b]) and of the run (N, M, t, coupling, path).
+    The arrays of FIELDS are attributes; they stay valid until close().
+
+    '''
+
+    def __init__(self,views,blocks,kappa,seed,N,M,t,coupling,path=None):
+        self.__dict__.update(views)
+        self._blocks = blocks
+        self.kappa = np.asarray(kappa,dtype=float)
+        self.seed = np.asarray(seed,dtype=np.int64)
+        self.N = N
+        self.M = M
+        self.t = t
+        self.coupling = coupling
+        self.path = path
+
+    def close(self):
+        for name in FIELDS:
+            self.__dict__.pop(name,None)
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+
+
+# FUNCTION TO RUN AN ENSEMBLE OVER A PROCESS POOL
+def run(kappas,seeds,N,M,t,coupling='global',processes=None,path=None):
+
+    '''
+    Runs one member per (kappa, seed) pair over a process pool, the results
+    being written in place in blocks shared with the parent.
+
+    Parameters
+    ----------
+    kappas: Iterable of coupling values
+    seeds: Iterable of integer seeds
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    t: Time interval for simulation
+    coupling: 'sparse', 'ring' or 'global', see run_member
+    processes: Number of worker processes (default: all the cores)
+    path: Optional directory; the blocks are then memory-mapped .npy files
+          kept after the run (see load) instead of shared memory
+
+    Returns
+    -------
+    results: Results with the blocks theta, omega_k, w, r and phi of the B
+             members, ordered by kappa and seed
+
+    See Also
+    -------
+    multiprocessing.shared_memory: Blocks of memory shared between processes
+    numpy.lib.format.open_memmap: Open a .npy file as a memory-mapped array.
+
+    '''
+
+    members = [(float(kappa),int(seed)) for kappa in kappas for seed in seeds]
+    kappa = [member[0] for member in members]
+    seed = [member[1] for member in members]
+    t = np.asarray(t,dtype=float)
+
+    if path is not None:
+        os.makedirs(path,exist_ok=True)
+        with open(os.path.join(path,'meta.json'),'w') as file:
+            json.dump({'kappa':kappa,'seed':seed,'N':int(N),'M':int(M),'coupling':coupling},file,indent=2)
+        np.save(os.path.join(path,'t.npy'),t)
+
+    specs,views,blocks = _allocate(_shapes(len(members),N,len(t)),path)
+    jobs = [(b,kappa[b],seed[b],N,M,t,coupling) for b in range(0,len(members))]
+
+    try:
+        with multiprocessing.Pool(processes,initializer=_init,initargs=(specs,)) as pool:
+            for b in pool.imap_unordered(run_member,jobs):
+                pass
+    except BaseException:
+        views = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+
+    return Results(views,blocks,kappa,seed,N,M,t,coupling,path)
+
+
+
+# FUNCTION TO REOPEN THE RESULTS OF A RUN WRITTEN TO A PATH
+def load(path,mode='r'):
+
+    '''
+    Opens the memory-mapped result blocks of run(...,path=path).
+
+    Parameters
+    ----------
+    path: Directory given to run
+    mode: Mode of the memory maps, 'r' (read-only) or 'r+' (read-write)
+
+    Returns
+    -------
+    results: Results on the memory-mapped blocks
+
+    '''
+
+    with open(os.path.join(path,'meta.json')) as file:
+        meta = json.load(file)
+
+    t = np.load(os.path.join(path,'t.npy'))
+    views = {name:np.load(os.path.join(path,name+'.npy'),mmap_mode=mode) for name in FIELDS}
+
+    return Results(views,[],meta['kappa'],meta['seed'],meta['N'],meta['M'],t,meta['coupling'],path)
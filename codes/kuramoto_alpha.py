@@ -8,7 +8,7 @@ Created on Sat Nov  7 18:23:13 2020
 
 import numpy as np
 import numba
-from numba import jit
+from numba import jit, prange
 
 
 # FUNCTION FOR NUMERICAL INTEGRATION USING EULER METHOD
@@ -31,14 +31,16 @@ Parameters
     w: Providing random natural frequencies between 0 and 1
     M: Number of neighbouring oscillators
     kappa: Critical coupling value
+    args: Tuple of extra arguments passed on to the function after kappa
+          (e.g. the neighbour list used by kuramoto_sparse)
 
 '''
 @jit(nopython=True)# Imported from Numba module to decrease runtime
-def Euler(f,t,theta,N,M,w,kappa):
+def Euler(f,t,theta,N,M,w,kappa,args=()):
        
     for n in range(0,len(t)-1):
         delta_t = t[n+1]-t[n]
-        theta[:,n+1]=theta[:,n]+f(theta[:,n],t[n],N,t,M,w,kappa)* delta_t
+        theta[:,n+1]=theta[:,n]+f(theta[:,n],t[n],N,t,M,w,kappa,*args)* delta_t
             
     return theta
 
@@ -67,13 +69,14 @@ Parameters
     w: Providing random natural frequencies between 0 and 1
     M: Number of neighbouring oscillators
     kappa: Critical coupling value
+    args: Tuple of extra arguments passed on to the function after kappa
 '''
 @jit(nopython=True) # Imported from Numba module to decrease runtime
-def RK2(f,t,theta,N,M,w,kappa):
+def RK2(f,t,theta,N,M,w,kappa,args=()):
     
     for n in range(0,len(t)-1):
         delta_t=t[n+1]-t[n]
-        theta[:,n+1]=theta[:,n]+f(theta[:,n]+(f(theta[:,n],t[n],N,t,M,w,kappa)*delta_t/2),(t[n]+delta_t/2),N,t,M,w,kappa)*(delta_t)
+        theta[:,n+1]=theta[:,n]+f(theta[:,n]+(f(theta[:,n],t[n],N,t,M,w,kappa,*args)*delta_t/2),(t[n]+delta_t/2),N,t,M,w,kappa,*args)*(delta_t)
     
     return theta
 '''
@@ -99,6 +102,7 @@ Parameters
     w: Providing random natural frequencies between 0 and 1
     M: Number of neighbouring oscillators
     kappa: Critical coupling value
+    args: Tuple of extra arguments passed on to the function after kappa
     
 See also:
 -----------------
@@ -107,17 +111,23 @@ See also:
 '''
 
 @jit(nopython=True) # Imported from Numba module to decrease runtime
-def RK4(f,t,theta,N,M,w,kappa):
+def RK4(f,t,theta,N,M,w,kappa,args=()):
 
     omega_k = np.zeros((N,len(t)))
     
+    return RK4_into(f,t,theta,omega_k,N,M,w,kappa,args)
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def RK4_into(f,t,theta,omega_k,N,M,w,kappa,args=()):
+    
     for n in range(0,len(t)-1):
         delta_t= t[n+1]-t[n]
-        k1 = f(theta[:,n],t[n],N,t,M,w,kappa)
+        k1 = f(theta[:,n],t[n],N,t,M,w,kappa,*args)
         omega_k[:,n] = k1
-        k2 = f(theta[:,n]+ k1*delta_t/2,t[n]+ delta_t/2,N,t,M,w,kappa)
-        k3 = f(theta[:,n]+ k2*delta_t/2,t[n]+ delta_t/2,N,t,M,w,kappa)
-        k4 = f(theta[:,n]+ k3*delta_t,t[n]+ delta_t,N,t,M,w,kappa)
+        k2 = f(theta[:,n]+ k1*delta_t/2,t[n]+ delta_t/2,N,t,M,w,kappa,*args)
+        k3 = f(theta[:,n]+ k2*delta_t/2,t[n]+ delta_t/2,N,t,M,w,kappa,*args)
+        k4 = f(theta[:,n]+ k3*delta_t,t[n]+ delta_t,N,t,M,w,kappa,*args)
         theta[:,n+1]=theta[:,n]+(k1+2*k2+2*k3+k4) * (delta_t/6)
             
 
@@ -131,7 +141,428 @@ Returns
            RK4 integration / Phase differences at every point of time.
     omega_k:  First order derivatives of the phase differences or 
                 the velocity of the ith oscillators at every given time t
+
+RK4_into is RK4 writing the velocities into a given (N,len(t)) array omega_k 
+(e.g. a block of shared memory) instead of a new one; its last column is not 
+written.
+'''
+
+
+#FUNCTION FOR ADAPTIVE NUMERICAL INTEGRATION USING THE DORMAND-PRINCE RK45 PAIR
+
+# Butcher tableau of the Dormand-Prince method, the embedded error estimate 
+# and the coefficients of its 4th order dense output
+C_DP = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+A_DP = np.array([[0, 0, 0, 0, 0],
+                 [1/5, 0, 0, 0, 0],
+                 [3/40, 9/40, 0, 0, 0],
+                 [44/45, -56/15, 32/9, 0, 0],
+                 [19372/6561, -25360/2187, 64448/6561, -212/729, 0],
+                 [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656]])
+B_DP = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+E_DP = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+P_DP = np.array([[1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+                 [0, 0, 0, 0],
+                 [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+                 [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+                 [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+                 [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+                 [0, 40617522/29380423, -110615467/29380423, 69997945/29380423]])
+
+'''
+Embedded Runge-Kutta method of order 5(4) with adaptive step size. The 
+difference between the 5th and the embedded 4th order solutions estimates 
+the local error; steps are rejected and shrunk when the error exceeds the 
+tolerance and grow again when the dynamics is slow (e.g. once the system 
+has synchronised). The steps are independent of the grid t: the solution at 
+the times of t is obtained from the 4th order dense output of the steps 
+that contain them, so the result has the same layout as RK4.
+
+The error is measured relative to atol + rtol*|theta|. The phases are not 
+taken modulo 2pi and grow with time, so atol is the tolerance that matters 
+for long runs. A step is only accepted when its error norm is at most 1, so 
+a step giving NaN is rejected too, and RuntimeError is raised when the step 
+size becomes too small to advance the time.
+
+Parameters 
+    -------------
+    function: kuramoto
+    t: Times at which the solution is returned
+    theta: Initial values of theta, theta[:,0]
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    args: Tuple of extra arguments passed on to the function after kappa
+    rtol: Relative tolerance
+    atol: Absolute tolerance
+    
+See also:
+-----------------
+   Hairer, Norsett and Wanner, Solving Ordinary Differential Equations I, 
+   Section II.5 and II.6 (the same coefficients as scipy.integrate.RK45)
+   
+'''
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def RK45(f,t,theta,N,M,w,kappa,args=(),rtol=1e-6,atol=1e-6):
+
+    K = np.zeros((7,N))
+    y = theta[:,0].copy()
+    time = t[0]
+    K[0] = f(y,time,N,t,M,w,kappa,*args)
+    nfev = 1
+    
+    # Initial step from the size of the solution and of its derivatives
+    scale = atol+rtol*np.abs(y)
+    d0 = np.sqrt(np.mean((y/scale)**2))
+    d1 = np.sqrt(np.mean((K[0]/scale)**2))
+    if d0 < 1e-5 or d1 < 1e-5:
+        h0 = 1e-6
+    else:
+        h0 = 0.01*d0/d1
+    f1 = f(y+h0*K[0],time+h0,N,t,M,w,kappa,*args)
+    nfev += 1
+    d2 = np.sqrt(np.mean(((f1-K[0])/scale)**2))/h0
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6,h0*1e-3)
+    else:
+        h1 = (0.01/max(d1,d2))**(1/5)
+    h = min(100*h0,h1,t[-1]-t[0])
+    
+    n = 1 # next output index
+    while n < len(t):
+        h = min(h,t[-1]-time)
+        
+        for s in range(1,6):
+            y_stage = y.copy()
+            for j in range(0,s):
+                y_stage += h*A_DP[s,j]*K[j]
+            K[s] = f(y_stage,time+C_DP[s]*h,N,t,M,w,kappa,*args)
+        y_new = y.copy()
+        for j in range(0,6):
+            y_new += h*B_DP[j]*K[j]
+        K[6] = f(y_new,time+h,N,t,M,w,kappa,*args)
+        nfev += 6
+        
+        err = np.zeros(N)
+        for j in range(0,7):
+            err += h*E_DP[j]*K[j]
+        scale = atol+rtol*np.maximum(np.abs(y),np.abs(y_new))
+        err_norm = np.sqrt(np.mean((err/scale)**2))
+        
+        if not err_norm <= 1: # rejected (NaN included), retry with a smaller step
+            if np.isnan(err_norm):
+                h = h*0.2
+            else:
+                h = h*max(0.2,0.9*err_norm**(-1/5))
+            if time+h == time:
+                raise RuntimeError('RK45: the step size underflowed, the solution is not finite or too stiff')
+            continue
+        
+        # Dense output for every requested time inside the accepted step
+        time_new = time+h
+        while n < len(t) and t[n] <= time_new:
+            x = (t[n]-time)/h
+            theta[:,n] = y
+            for j in range(0,7):
+                b = x*(P_DP[j,0]+x*(P_DP[j,1]+x*(P_DP[j,2]+x*P_DP[j,3])))
+                theta[:,n] += h*b*K[j]
+            n += 1
+        
+        y = y_new
+        time = time_new
+        K[0] = K[6] # first same as last
+        if err_norm == 0:
+            h = h*10
+        else:
+            h = h*min(10.0,max(0.2,0.9*err_norm**(-1/5)))
+            
+    return theta,nfev
+
+'''
+Returns 
+    -------------
+    
+    theta: Numpy Array - Solution for the solved ODE of the Kuramoto model using 
+           adaptive RK45 integration at every time of t.
+    nfev:  Number of evaluations of the function
+'''
+
+
+# FUNCTIONS TO ADVANCE ONLY THE CURRENT STATE (STREAMING MODE)
+'''
+Same schemes as Euler, RK2 and RK4, but only the current phases (a NumPy 
+array of length N) are kept: the state is advanced from t[n0] to t[n1] and 
+returned, no (N,len(t)) history is stored. These are the building blocks of 
+stream.integrate, which calls them in chunks and hands the state to the 
+observers in between.
+
+Parameters 
+    -------------
+    function: kuramoto
+    t: Time interval for simulation
+    theta: Current values of theta (at time t[n0])
+    n0, n1: Indices of the first and last time of the chunk
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    args: Tuple of extra arguments passed on to the function after kappa
+    
+Returns 
+    -------------
+    theta: NumPy array with the phases at time t[n1]
+'''
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def Euler_steps(f,t,theta,n0,n1,N,M,w,kappa,args=()):
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta = theta+f(theta,t[n],N,t,M,w,kappa,*args)*delta_t
+        
+    return theta
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def RK2_steps(f,t,theta,n0,n1,N,M,w,kappa,args=()):
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        k1 = f(theta,t[n],N,t,M,w,kappa,*args)
+        theta = theta+f(theta+k1*delta_t/2,t[n]+delta_t/2,N,t,M,w,kappa,*args)*delta_t
+        
+    return theta
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def RK4_steps(f,t,theta,n0,n1,N,M,w,kappa,args=()):
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        k1 = f(theta,t[n],N,t,M,w,kappa,*args)
+        k2 = f(theta+ k1*delta_t/2,t[n]+ delta_t/2,N,t,M,w,kappa,*args)
+        k3 = f(theta+ k2*delta_t/2,t[n]+ delta_t/2,N,t,M,w,kappa,*args)
+        k4 = f(theta+ k3*delta_t,t[n]+ delta_t,N,t,M,w,kappa,*args)
+        theta = theta+(k1+2*k2+2*k3+k4)*(delta_t/6)
+        
+    return theta
+
+
+
+# FUNCTIONS FOR NUMERICAL INTEGRATION USING STRANG SPLITTING
 '''
+The right hand side is the free rotation w plus the coupling, C(theta) = 
+f(theta) - w. Strang splitting advances every step as
+
+    theta += w*delta_t/2            (free rotation, exact)
+    theta' = C(theta) over delta_t  (coupling only, numerically)
+    theta += w*delta_t/2            (free rotation, exact)
+
+The coupling is evaluated by calling the same function with zero natural 
+frequencies, so any right hand side of this module can be used, and the 
+coupling step is the midpoint (RK2) rule. This is a second order scheme with 
+two evaluations per step, like RK2. It helps only when the rotation dominates 
+(spread of w large against kappa), where its error is about half that of 
+RK2 for the same step. When the coupling dominates it is less accurate than 
+RK2, and it is no more stable: w is a constant drift and adds no stiffness. 
+RK4 is more accurate per evaluation in every regime. Strang_steps is the 
+streaming version, for stream.integrate.
+
+Parameters 
+    -------------
+    function: kuramoto
+    t: Time interval for simulation
+    theta: Initial values of theta (Strang), or current values at time t[n0] 
+           (Strang_steps)
+    n0, n1: Indices of the first and last time of the chunk (Strang_steps)
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    args: Tuple of extra arguments passed on to the function after kappa
+    
+Returns 
+    -------------
+    theta: Numpy Array - Solution of the Kuramoto model at every point of 
+           time (Strang), or the phases at time t[n1] (Strang_steps)
+'''
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def Strang(f,t,theta,N,M,w,kappa,args=()):
+    
+    for n in range(0,len(t)-1):
+        theta[:,n+1] = Strang_steps(f,t,theta[:,n],n,n+1,N,M,w,kappa,args)
+        
+    return theta
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def Strang_steps(f,t,theta,n0,n1,N,M,w,kappa,args=()):
+    
+    w_0 = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta = theta+w*(delta_t/2)
+        k1 = f(theta,t[n],N,t,M,w_0,kappa,*args)
+        theta = theta+f(theta+k1*delta_t/2,t[n]+delta_t/2,N,t,M,w_0,kappa,*args)*delta_t
+        theta = theta+w*(delta_t/2)
+        
+    return theta
+
+
+# FUNCTIONS FOR ALLOCATION-FREE NUMERICAL INTEGRATION USING RK4
+'''
+RK4 with the four stages fused into one compiled loop. The right hand side 
+writes its result into a preallocated buffer (the _into kernels: 
+kuramoto_sparse_into, kuramoto_global_into, kuramoto_fft_into), the stage 
+states and the four slopes live in work buffers allocated once per call, and 
+the phases are stored time-major, theta[n] being the contiguous array of 
+the N phases at time t[n]. A step therefore allocates nothing and only walks 
+contiguous memory. RK4_fused_steps is the same scheme on the current state 
+only, for stream.integrate; its work buffers can be passed in so that 
+successive chunks do not allocate either.
+
+Parameters 
+    -------------
+    function: kuramoto_sparse_into, kuramoto_global_into or kuramoto_fft_into
+    t: Time interval for simulation
+    theta: NumPy array of shape (len(t),N) with the initial values in theta[0]
+           (RK4_fused), or current values of length N (RK4_fused_steps, 
+           updated in place)
+    n0, n1: Indices of the first and last time of the chunk (RK4_fused_steps)
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    args: Tuple of extra arguments passed on to the function after kappa
+    work: Optional work buffers of shape (5,N) (RK4_fused_steps)
+    
+Returns 
+    -------------
+    theta: Numpy Array of shape (len(t),N) - Solution of the Kuramoto model 
+           at every point of time (RK4_fused), or the phases at t[n1] 
+           (RK4_fused_steps)
+'''
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def RK4_fused(f,t,theta,N,M,w,kappa,args=()):
+    
+    work = np.zeros((5,N))
+    for n in range(0,len(t)-1):
+        theta[n+1] = theta[n]
+        RK4_fused_steps(f,t,theta[n+1],n,n+1,N,M,w,kappa,args,work)
+        
+    return theta
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def RK4_fused_steps(f,t,theta,n0,n1,N,M,w,kappa,args=(),work=None):
+    
+    if work is None:
+        work = np.zeros((5,N))
+    k1 = work[0]
+    k2 = work[1]
+    k3 = work[2]
+    k4 = work[3]
+    stage = work[4]
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        f(k1,theta,t[n],N,t,M,w,kappa,*args)
+        for i in range(0,N):
+            stage[i] = theta[i]+k1[i]*delta_t/2
+        f(k2,stage,t[n]+delta_t/2,N,t,M,w,kappa,*args)
+        for i in range(0,N):
+            stage[i] = theta[i]+k2[i]*delta_t/2
+        f(k3,stage,t[n]+delta_t/2,N,t,M,w,kappa,*args)
+        for i in range(0,N):
+            stage[i] = theta[i]+k3[i]*delta_t
+        f(k4,stage,t[n]+delta_t,N,t,M,w,kappa,*args)
+        for i in range(0,N):
+            theta[i] += (k1[i]+2*k2[i]+2*k3[i]+k4[i])*(delta_t/6)
+            
+    return theta
+
+
+# FUNCTIONS FOR NUMERICAL INTEGRATION OF THE NOISY KURAMOTO MODEL
+'''
+Stochastic integrators of d(theta) = f(theta,t) dt + sqrt(2D) dW, where W is a 
+vector of N independent Wiener processes. The Gaussian increments are drawn 
+at every step, scaled by sqrt(2*D*delta_t), so no (N,len(t)) noise array is 
+needed and the results converge when delta_t is refined. 
+
+Euler_Maruyama is of strong order 1/2 (order 1 for this additive noise); 
+Heun is the stochastic Heun (predictor-corrector) scheme, of weak order 2 for 
+additive noise. Euler_Maruyama and Heun draw the N normals of every step, 
+inside the jitted loop, from the NumPy Generator rng 
+(np.random.default_rng(seed)), so a run is reproducible. The _steps 
+versions advance only the current state for stream.integrate and draw 
+nothing: they take the standard normals of the chunk, an (n1-n0,N) array, 
+which stream.integrate draws from its own Generator (pass D as a keyword and 
+rng to stream.integrate). Both paths consume the Generator in the same order, 
+so the same seed gives the same noise, and its state is the public, picklable 
+state of that Generator.
+
+Parameters 
+    -------------
+    function: kuramoto
+    t: Time interval for simulation
+    theta: Initial values of theta
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    D: Noise intensity
+    rng: NumPy Generator of the normals (Euler_Maruyama, Heun)
+    args: Tuple of extra arguments passed on to the function after kappa
+    n0, n1: Indices of the first and last time of the chunk (_steps)
+    normals: NumPy array of shape (n1-n0,N) of standard normals (_steps)
+    
+Returns 
+    -------------
+    theta: Numpy Array - Solution of the noisy Kuramoto model at every point of time.
+'''
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def Euler_Maruyama_steps(f,t,theta,n0,n1,N,M,w,kappa,args,D,normals):
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        xi = np.sqrt(2*D*delta_t)*normals[n-n0]
+        theta = theta+f(theta,t[n],N,t,M,w,kappa,*args)*delta_t+xi
+        
+    return theta
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def Heun_steps(f,t,theta,n0,n1,N,M,w,kappa,args,D,normals):
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        xi = np.sqrt(2*D*delta_t)*normals[n-n0]
+        k1 = f(theta,t[n],N,t,M,w,kappa,*args)
+        k2 = f(theta+k1*delta_t+xi,t[n+1],N,t,M,w,kappa,*args)
+        theta = theta+(k1+k2)*(delta_t/2)+xi
+        
+    return theta
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def Euler_Maruyama(f,t,theta,N,M,w,kappa,D,rng,args=()):
+    
+    for n in range(0,len(t)-1):
+        normals = rng.standard_normal((1,N))
+        theta[:,n+1] = Euler_Maruyama_steps(f,t,theta[:,n],n,n+1,N,M,w,kappa,args,D,normals)
+        
+    return theta
+
+
+@jit(nopython=True) # Imported from Numba module to decrease runtime
+def Heun(f,t,theta,N,M,w,kappa,D,rng,args=()):
+    
+    for n in range(0,len(t)-1):
+        normals = rng.standard_normal((1,N))
+        theta[:,n+1] = Heun_steps(f,t,theta[:,n],n,n+1,N,M,w,kappa,args,D,normals)
+        
+    return theta
 
 
 # FUNCTION TO NUMERICALLY REPRESENT THE KURAMOTO MODEL
@@ -157,7 +588,7 @@ the numerical integration is performed.
        np.zeros: Return a new array of given shape and type, filled with zeros(used for intilisation)
 
 '''
-@jit(nopython=True) # Imported from Numba module to decrease runtime
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
 def kuramoto(theta,time,N,t,M,w,kappa):
         
         K = np.zeros((N,N))
@@ -184,5 +615,380 @@ Returns
     
 '''
 
-      
 
+
+# FUNCTION TO BUILD THE NEIGHBOUR LIST OF THE CHAIN
+'''
+Precomputes, once per run, the neighbours of every oscillator in a compressed
+sparse row (CSR) layout: the neighbours of oscillator i are
+indices[indptr[i]:indptr[i+1]] with coupling weights weights[indptr[i]:indptr[i+1]].
+The neighbourhood is the same as in kuramoto, i.e. the oscillators i+p and i-p
+for p = 1,...,M-1.
+
+    Parameters:
+        -----------------
+        N: Total number of oscillators.
+        M: Number of neighbouring oscillators
+        closed: False for an open chain (as in kuramoto), True for a closed ring
+                where the indices are taken modulo N
+
+    See also:
+        -----------------
+       np.zeros: Return a new array of given shape and type, filled with zeros(used for intilisation)
+
+'''
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def neighbour_list(N,M,closed=False):
+
+    indptr = np.zeros(N+1,dtype=np.int64)
+    indices = np.zeros(2*max(M-1,0)*N,dtype=np.int64)
+    nnz = 0
+
+    for i in range(0,N):
+        for p in range(1,M):
+            for j in (i-p,i+p):
+                if closed:
+                    j = j%N
+                elif (j<0 or j>=N): # no wrap around in an open chain
+                    continue
+                if j==i:
+                    continue
+                seen = False
+                if closed and 2*(M-1)>=N: # small rings: avoid counting a neighbour twice
+                    for k in range(indptr[i],nnz):
+                        if indices[k]==j:
+                            seen = True
+                if not seen:
+                    indices[nnz] = j
+                    nnz += 1
+        indptr[i+1] = nnz
+
+    weights = np.ones(nnz)
+
+    return indptr,indices[:nnz].copy(),weights
+'''
+Returns 
+    -------------
+    indptr: NumPy array of length N+1 with the offsets of every row
+    indices: NumPy array with the neighbour indices of all the oscillators
+    weights: NumPy array with the coupling weight of every neighbour (ones, 
+             scaled by kappa in kuramoto_sparse)
+'''
+
+
+
+# FUNCTION TO NUMERICALLY REPRESENT THE KURAMOTO MODEL WITH A NEIGHBOUR LIST
+'''
+Drop-in replacement of kuramoto for Euler, RK2 and RK4. Only the neighbours
+stored in the list built by neighbour_list are visited, so one evaluation
+costs O(N*M) instead of O(N^2*M) and no N x N coupling matrix is allocated.
+It is used as
+
+    args = neighbour_list(N,M)
+    theta,omega_k = RK4(kuramoto_sparse,t,theta,N,M,w,kappa,args)
+
+    Parameters:
+        -----------------
+        
+        theta: Theta value at the time of the working of the integrator
+        time: Time value for the working of the integrator
+        N: Total number of oscillators.
+        t: Time interval for simulation
+        w: Providing random natural frequencies between 0 and 1
+        M: Number of neighbouring oscillators
+        kappa: Critical coupling value
+        indptr, indices, weights: Neighbour list returned by neighbour_list
+
+'''
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_sparse(theta,time,N,t,M,w,kappa,indptr,indices,weights):
+
+        theta_dot = np.zeros(N)
+        kuramoto_sparse_into(theta_dot,theta,time,N,t,M,w,kappa,indptr,indices,weights)
+
+        return theta_dot
+'''
+Returns 
+    -------------
+    theta_dot : NumPy array with the first order derivative of the Input theta values
+    
+'''
+
+
+
+# FUNCTION TO NUMERICALLY REPRESENT THE KURAMOTO MODEL WITH GLOBAL COUPLING
+'''
+For all-to-all coupling the sum over j of sin(theta_j - theta_i + alpha)
+collapses to N*R*sin(phi - theta_i + alpha), where R*exp(i*phi) is the complex
+order parameter of order_parameter.order. The order parameter is computed
+once per evaluation, so every call costs O(N) instead of O(N^2). A uniform
+phase lag alpha (as the dephasing of kuramoto_modified) can be given
+through the args of the integrators:
+
+    theta,omega_k = RK4(kuramoto_global,t,theta,N,M,w,kappa,(alpha,))
+
+    Parameters:
+        -----------------
+        
+        theta: Theta value at the time of the working of the integrator
+        time: Time value for the working of the integrator
+        N: Total number of oscillators.
+        t: Time interval for simulation
+        w: Providing random natural frequencies between 0 and 1
+        M: Number of neighbouring oscillators (unused, every oscillator is coupled)
+        kappa: Critical coupling value
+        alpha: Uniform phase lag
+
+'''
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_global(theta,time,N,t,M,w,kappa,alpha=0.0):
+
+        theta_dot = np.zeros(N)
+        kuramoto_global_into(theta_dot,theta,time,N,t,M,w,kappa,alpha)
+
+        return theta_dot
+'''
+Returns 
+    -------------
+    theta_dot : NumPy array with the first order derivative of the Input theta values
+    
+'''
+
+
+
+# FUNCTION TO BUILD A TRANSLATION INVARIANT COUPLING KERNEL ON A RING
+def ring_kernel(N,kind='exponential',reach=1.0,A=0.995):
+    
+    '''
+    Builds a nonlocal coupling kernel G(i-j) on a closed ring of N oscillators
+    and returns its discrete Fourier transform, which is what kuramoto_fft uses.
+    Chimera states appear for such wide, translation invariant kernels.
+
+    Parameters:
+        -----------------
+        N: Total number of oscillators.
+        kind: 'exponential' for G(d) = exp(-d/reach),
+              'cosine' for G(d) = 1 + A*cos(2*pi*d/N) (Abrams and Strogatz),
+              'step' for G(d) = 1 if 1 <= d <= reach
+        reach: Coupling range in number of oscillators ('exponential', 'step')
+        A: Modulation of the cosine kernel
+        
+    Returns:
+        -----------------
+        G_hat: NumPy array with the Fourier transform of the kernel
+        
+    See also:
+        -----------------
+        numpy.fft.fft: Compute the one-dimensional discrete Fourier Transform.
+        
+    '''
+    
+    k = np.arange(0,N,1)
+    d = np.minimum(k,N-k) # distance along the ring
+    
+    if kind == 'exponential':
+        G = np.exp(-d/reach)
+        G[0] = 0 # no self coupling
+    elif kind == 'cosine':
+        G = 1 + A*np.cos(2*np.pi*d/N)
+    elif kind == 'step':
+        G = np.where((d>=1) & (d<=reach),1.0,0.0)
+    else:
+        raise ValueError("unknown kernel '{}'".format(kind))
+    
+    return np.fft.fft(G)
+
+
+
+# FUNCTION TO NUMERICALLY REPRESENT THE KURAMOTO MODEL WITH A NONLOCAL RING KERNEL
+'''
+For a translation invariant kernel G on a closed ring the coupling sum
+sum_j G(i-j)*sin(theta_j - theta_i + alpha) equals
+Im(exp(-i*theta_i + i*alpha) * (G * exp(i*theta))_i), where * is a circular
+convolution. The convolution is evaluated with the FFT, so one call costs
+O(N log N) whatever the reach of the kernel. It is used as
+
+    G_hat = ring_kernel(N,'exponential',reach)
+    theta,omega_k = RK4(kuramoto_fft,t,theta,N,M,w,kappa,(G_hat,alpha))
+
+    Parameters:
+        -----------------
+        
+        theta: Theta value at the time of the working of the integrator
+        time: Time value for the working of the integrator
+        N: Total number of oscillators.
+        t: Time interval for simulation
+        w: Providing random natural frequencies between 0 and 1
+        M: Number of neighbouring oscillators (unused, the kernel sets the reach)
+        kappa: Critical coupling value
+        G_hat: Fourier transform of the kernel returned by ring_kernel
+        alpha: Uniform phase lag
+
+    See also:
+        -----------------
+       numba.objmode: numpy.fft is not supported in nopython mode, so the
+                      transforms are done in object mode.
+
+'''
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_fft(theta,time,N,t,M,w,kappa,G_hat,alpha=0.0):
+
+        z = np.exp(theta*1j)
+        
+        with numba.objmode(conv='complex128[:]'):
+            conv = np.fft.ifft(G_hat*np.fft.fft(z))
+
+        theta_dot = w + (kappa/N)*np.imag(np.exp((alpha-theta)*1j)*conv)
+
+        return theta_dot
+'''
+Returns 
+    -------------
+    theta_dot : NumPy array with the first order derivative of the Input theta values
+    
+'''
+
+
+
+# FUNCTIONS WRITING THE RIGHT HAND SIDE INTO A PREALLOCATED BUFFER
+'''
+Same models as kuramoto_sparse, kuramoto_global and kuramoto_fft, for 
+RK4_fused: the derivative is written into theta_dot instead of a new array 
+and no temporary array is built, except for the transforms of kuramoto_fft_into 
+which numpy.fft allocates. kuramoto_sparse and kuramoto_global allocate 
+theta_dot and call them, and the parallel versions below and domain.py share 
+their inner loops, sparse_coupling and block_sums, so every version computes 
+each oscillator with the same operations. kuramoto_sparse_segment only 
+computes the oscillators lo,...,hi-1.
+
+The mean field is summed over blocks of BLOCK oscillators whose partial sums 
+are added in order, as kuramoto_global_parallel does on several cores.
+
+    Parameters:
+        -----------------
+        theta_dot: NumPy array of length N receiving the derivative
+        theta, time, N, t, M, w, kappa: See kuramoto
+        args: indptr, indices, weights (kuramoto_sparse_into), alpha 
+              (kuramoto_global_into) or G_hat, alpha (kuramoto_fft_into)
+
+'''
+BLOCK = 4096
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def sparse_coupling(theta,i,indptr,indices,weights):
+
+        sum_ = 0.0
+        for k in range(indptr[i],indptr[i+1]):
+            sum_ += weights[k]*np.sin(theta[indices[k]]-theta[i])
+
+        return sum_
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_sparse_segment(theta_dot,theta,lo,hi,N,w,kappa,indptr,indices,weights):
+
+        for i in range(lo,hi):
+            theta_dot[i] = w[i] + (kappa/N)*sparse_coupling(theta,i,indptr,indices,weights)
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_sparse_into(theta_dot,theta,time,N,t,M,w,kappa,indptr,indices,weights):
+
+        kuramoto_sparse_segment(theta_dot,theta,0,N,N,w,kappa,indptr,indices,weights)
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def block_sums(theta,b,N):
+
+        C = 0.0
+        S = 0.0
+        for i in range(b*BLOCK,min(N,(b+1)*BLOCK)):
+            C += np.cos(theta[i])
+            S += np.sin(theta[i])
+
+        return C,S
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_global_into(theta_dot,theta,time,N,t,M,w,kappa,alpha=0.0):
+
+        C = 0.0
+        S = 0.0
+        for b in range(0,(N+BLOCK-1)//BLOCK):
+            C_b,S_b = block_sums(theta,b,N)
+            C += C_b
+            S += S_b
+        r = np.sqrt(C*C+S*S)/N
+        phi = np.arctan2(S,C)
+        
+        for i in range(0,N):
+            theta_dot[i] = w[i] + kappa*r*np.sin(phi-theta[i]+alpha)
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_fft_into(theta_dot,theta,time,N,t,M,w,kappa,G_hat,alpha=0.0):
+
+        z = np.exp(theta*1j)
+        
+        with numba.objmode(conv='complex128[:]'):
+            conv = np.fft.ifft(G_hat*np.fft.fft(z))
+
+        for i in range(0,N):
+            theta_dot[i] = w[i] + (kappa/N)*(np.cos(alpha-theta[i])*conv[i].imag
+                                              +np.sin(alpha-theta[i])*conv[i].real)
+
+
+
+# FUNCTIONS EVALUATING THE RIGHT HAND SIDE ON SEVERAL CORES
+'''
+Same models as kuramoto_sparse, kuramoto_sparse_into and kuramoto_global, 
+with the loop over the oscillators split across the cores by prange. Every 
+oscillator still sums its own neighbours with sparse_coupling, and the mean 
+field of kuramoto_global_parallel is summed over the blocks of block_sums 
+whose partial sums are added serially, so the results are those of the 
+serial kernels and do not depend on the number of threads (set with 
+NUMBA_NUM_THREADS or numba.set_num_threads): a run is reproducible bit for 
+bit. They plug into every integrator in place of their serial counterparts.
+
+    Parameters:
+        -----------------
+        See kuramoto_sparse, kuramoto_sparse_into and kuramoto_global
+
+'''
+@jit(nopython=True,parallel=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_sparse_parallel(theta,time,N,t,M,w,kappa,indptr,indices,weights):
+
+        theta_dot = np.zeros(N)
+        kuramoto_sparse_into_parallel(theta_dot,theta,time,N,t,M,w,kappa,indptr,indices,weights)
+            
+        return theta_dot
+
+
+@jit(nopython=True,parallel=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_sparse_into_parallel(theta_dot,theta,time,N,t,M,w,kappa,indptr,indices,weights):
+
+        for i in prange(0,N):
+            theta_dot[i] = w[i] + (kappa/N)*sparse_coupling(theta,i,indptr,indices,weights)
+
+
+@jit(nopython=True,parallel=True,cache=True) # Imported from Numba module to decrease runtime
+def kuramoto_global_parallel(theta,time,N,t,M,w,kappa,alpha=0.0):
+
+        blocks = (N+BLOCK-1)//BLOCK
+        C_b = np.zeros(blocks)
+        S_b = np.zeros(blocks)
+        for b in prange(0,blocks):
+            C_b[b],S_b[b] = block_sums(theta,b,N)
+        C = 0.0
+        S = 0.0
+        for b in range(0,blocks):
+            C += C_b[b]
+            S += S_b[b]
+        r = np.sqrt(C*C+S*S)/N
+        phi = np.arctan2(S,C)
+        
+        theta_dot = np.zeros(N)
+        for i in prange(0,N):
+            theta_dot[i] = w[i] + kappa*r*np.sin(phi-theta[i]+alpha)
+            
+        return theta_dot
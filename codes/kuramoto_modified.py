@@ -8,7 +8,7 @@ Created on Sun Nov  8 20:37:31 2020
 
 import numpy as np
 import numba
-from numba import jit
+from numba import jit, prange
 
 
 '''
@@ -150,12 +150,49 @@ def RK4(f,theta,N,t,w,kappa,M,noise,K,tau,alpha):
 
 
 
-#FUNCTIONS TO BUILD K, τ AND α AS RANDOM MATRICES
+#FUNCTION FOR NUMERICAL INTEGRATION USING STRANG SPLITTING
 @jit(nopython=True)# Imported from Numba module to decrease runtime
+def Strang(f,theta,N,t,w,kappa,M,noise,K,tau,alpha):
+    
+    '''
+    Strang splitting, as kuramoto_alpha.Strang: half a step of the free 
+    rotation theta += w*delta_t/2, done exactly, a midpoint (RK2) step of the 
+    coupling and noise alone, i.e. of the function with zero natural 
+    frequencies, and the other half step of the free rotation. Its error is 
+    below that of RK2 only when the spread of w dominates the coupling, it 
+    allows no larger stable step, and RK4 is more accurate per evaluation.
+
+    Parameters 
+        -------------
+        function kuramoto (or kuramoto_dense)
+        See RK4
+        
+    Returns 
+    -------------
+        theta: Numpy Array - Solution for the solved ODE of the Kuramoto model using 
+              Strang splitting / Phase differences at every point of time.
+       
+    '''
+    
+    w_0 = np.zeros(N)
+
+    for n in range(0,len(t)-1):
+        delta_t = t[n+1]-t[n]
+        theta_n = theta[:,n]+w*(delta_t/2)
+        k1 = f(theta_n,t[n],noise[:,n],theta,n,N,M,w_0,kappa,K,tau,alpha)
+        theta_n = theta_n+f(theta_n+k1*delta_t/2,t[n]+delta_t/2,noise[:,n],theta,n,N,M,w_0,kappa,K,tau,alpha)*delta_t
+        theta[:,n+1] = theta_n+w*(delta_t/2)
+
+    return theta
+
+
+
+#FUNCTIONS TO BUILD K, τ AND α AS RANDOM MATRICES
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
 def random_values(N,t):
     
     K = np.random.uniform(0,2*np.pi,size=(N,N))
-    tau = np.random.randint(0,2*np.pi,size=(N,N))
+    tau = np.random.randint(0,6,size=(N,N)) # delays of 0 to 5 steps, as randint(0,2*np.pi) drew
     alpha = np.random.uniform(0,2*np.pi, size=(N,N))
     
     return K,tau,alpha
@@ -192,7 +229,7 @@ Parameters:
 
 '''
 
-@jit(nopython=True)# Imported from Numba module to decrease runtime
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
 def kuramoto(theta_i,time,eta,theta_matrix,n,N,M,w,kappa,K,tau,alpha):
     
 
@@ -202,7 +239,7 @@ def kuramoto(theta_i,time,eta,theta_matrix,n,N,M,w,kappa,K,tau,alpha):
         for i in range(0,N-1):
             for j in range (0,N-1):
                 for p in range (1,M):
-                    theta_j = theta_matrix[:,n-tau[i][j]]
+                    theta_j = theta_matrix[:,max(n-tau[i][j],0)]
                     if(j==i+p or j==i-p):
                         K[i][j]=kappa
                         sum_ +=  K[i][j]*np.sin(theta_j[j]-theta_i[i]+\
@@ -220,3 +257,695 @@ def kuramoto(theta_i,time,eta,theta_matrix,n,N,M,w,kappa,K,tau,alpha):
 
 
 
+
+
+
+#FUNCTIONS FOR THE DENSE HETEROGENEOUS COUPLING WITHOUT DELAY
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def dense_coupling(K,alpha):
+    
+    '''
+    Precomputes, once per simulation, the matrix used by kuramoto_dense. With 
+    c = cos(theta) and s = sin(theta),
+    
+        sum_j K[i][j]*sin(theta_j - theta_i + alpha[i][j])
+            = cos(theta_i)*(Kc s + Ks c)_i - sin(theta_i)*(Kc c - Ks s)_i
+    
+    where Kc = K*cos(alpha) and Ks = K*sin(alpha), so that the whole sum is 
+    one product of a (2,2N) matrix of cos/sin values with the transpose of 
+    P = [Kc Ks]. K and alpha are only read.
+    
+    Parameters:
+        -----------------
+        K: Coupling Matrix (N,N)
+        alpha: Dephasing Matrix (N,N)
+        
+    Returns 
+        -------------
+        P: NumPy array of shape (N,2N), [K*cos(alpha) K*sin(alpha)]
+        
+    '''
+    
+    N = K.shape[0]
+    P = np.empty((N,2*N))
+    P[:,:N] = K*np.cos(alpha)
+    P[:,N:] = K*np.sin(alpha)
+    
+    return P
+
+
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def kuramoto_dense(theta_i,time,eta,theta_matrix,n,N,M,w,kappa,P,tau,alpha):
+    
+    '''
+    Kuramoto model with a dense heterogeneous coupling K[i][j] and dephasing 
+    alpha[i][j] between all pairs and no delay,
+    
+        theta_dot_i = w_i + (1/N) sum_j K[i][j]*sin(theta_j - theta_i + alpha[i][j]) + eta_i
+    
+    evaluated as a single matrix product with the matrix P of dense_coupling, 
+    done by numpy (BLAS) in object mode. It has the arguments of kuramoto so 
+    that it plugs into Euler, RK2 and RK4, with P passed in place of K: 
+    
+        P = dense_coupling(K,alpha)
+        theta,omega_k = RK4(kuramoto_dense,theta,N,t,w,kappa,M,noise,P,tau,alpha)
+    
+    The coupling is the caller's K, which is neither overwritten nor replaced 
+    by kappa; theta_matrix, n, M, kappa, tau and alpha are not used.
+    
+    Parameters:
+        -----------------
+        theta_i: Theta value at the time of the working of the integrator
+        time: Time value for the working of the integrator
+        eta: Guassian white noise
+        P: Matrix of dense_coupling (N,2N)
+        See kuramoto for the other parameters
+        
+    Returns 
+        -------------
+        theta_dot : NumPy array with the first order derivative of the Input theta values
+        
+    '''
+    
+    c = np.cos(theta_i)
+    s = np.sin(theta_i)
+    x = np.empty((2,2*N))
+    x[0,:N] = s
+    x[0,N:] = c
+    x[1,:N] = c
+    x[1,N:] = -s
+    
+    with numba.objmode(y='float64[:,:]'):
+        y = x @ P.T
+        
+    theta_dot = w + (1/N)*(c*y[0]-s*y[1]) + eta
+        
+    return theta_dot
+
+
+
+#FUNCTION TO BUILD THE RING BUFFER OF THE DELAYED PHASES
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def delay_buffer(theta,tau):
+    
+    '''
+    Builds the circular buffer that keeps only the last max(tau)+1 columns of 
+    the phases, which is all the history the delayed coupling needs. Column 
+    head holds the current phases and the phases d steps in the past are in 
+    column (head-d) % L, so the memory does not depend on the length of the 
+    run. Before the first step, the history is constant and equal to the 
+    initial phases.
+
+    Parameters 
+        -------------
+        theta: Initial values of theta, NumPy array of length N
+        tau: Delay Matrix (integer number of steps)
+        
+    Returns 
+        -------------
+        history: NumPy array of shape (N,max(tau)+1) 
+        head: Column of history holding the current phases
+        
+    '''
+    
+    L = np.max(tau)+1
+    history = np.zeros((len(theta),L))
+    for d in range(0,L):
+        history[:,d] = theta
+        
+    return history,0
+
+
+
+# FUNCTION TO NUMERICALLY REPRESENT THE KURAMOTO MODEL WITH A DELAY BUFFER
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def delay_coupling(theta_i,i,history,head,N,M,kappa,tau,alpha):
+    
+    '''
+    Coupling sum of oscillator i over its neighbours i-p and i+p, with the 
+    delayed phases read from the ring buffer; shared by kuramoto_delay and 
+    kuramoto_delay_parallel.
+    '''
+    
+    L = history.shape[1]
+    sum_ = 0.0
+    
+    for p in range(1,M):
+        for j in (i-p,i+p):
+            if (j>=0 and j<N):
+                theta_j = history[j,(head-tau[i][j])%L]
+                sum_ += kappa*np.sin(theta_j-theta_i[i]+alpha[i][j])
+                
+    return sum_
+
+
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def kuramoto_delay(theta_i,time,eta,history,head,N,M,w,kappa,K,tau,alpha):
+    
+    '''
+    Same model as kuramoto, but the delayed phases theta_j(t - tau[i][j]) are 
+    read directly from the ring buffer built by delay_buffer instead of 
+    slicing a full column of the (N,len(t)) phase matrix. Only the neighbours 
+    i-p and i+p (p = 1,...,M-1, open chain) are visited, each oscillator gets 
+    its own coupling sum and the noise eta[i] is added once per oscillator. 
+    The coupling on the neighbourhood is kappa, as in kuramoto, and K is 
+    left untouched.
+    
+    Parameters:
+        -----------------
+        theta_i: Theta value at the time of the working of the integrator
+        time: Time value for the working of the integrator
+        eta: Guassian white noise
+        history: Ring buffer of the past phases (see delay_buffer)
+        head: Column of history holding the phases at the current step
+        N: Total number of oscillators.
+        M: Number of neighbouring oscillators
+        w: Providing random natural frequencies between 0 and 1
+        kappa: Critical coupling value
+        K: Coupling Matrix
+        tau: Delay Matrix
+        alpha: Dephasing Matrix
+        
+    Returns 
+        -------------
+        theta_dot : NumPy array with the first order derivative of the Input theta values
+        
+    '''
+    
+    theta_dot = np.zeros(N)
+    
+    for i in range(0,N):
+        theta_dot[i] = w[i] + (1/N)*delay_coupling(theta_i,i,history,head,N,M,kappa,tau,alpha) + eta[i]
+        
+    return theta_dot
+
+
+
+@jit(nopython=True,parallel=True,cache=True)# Imported from Numba module to decrease runtime
+def kuramoto_delay_parallel(theta_i,time,eta,history,head,N,M,w,kappa,K,tau,alpha):
+    
+    '''
+    Same model as kuramoto_delay, with the loop over the oscillators split 
+    across the cores by prange. Each oscillator sums its own neighbours with 
+    the delay_coupling of kuramoto_delay, so the result is identical and does 
+    not depend on the number of threads (NUMBA_NUM_THREADS or 
+    numba.set_num_threads). It plugs into the _delay integrators in place of 
+    kuramoto_delay.
+    
+    Parameters:
+        -----------------
+        See kuramoto_delay
+        
+    Returns 
+        -------------
+        theta_dot : NumPy array with the first order derivative of the Input theta values
+        
+    '''
+    
+    theta_dot = np.zeros(N)
+    
+    for i in prange(0,N):
+        theta_dot[i] = w[i] + (1/N)*delay_coupling(theta_i,i,history,head,N,M,kappa,tau,alpha) + eta[i]
+        
+    return theta_dot
+
+
+
+#FUNCTIONS FOR NUMERICAL INTEGRATION WITH A DELAY BUFFER
+'''
+Euler, RK2 and RK4 integration of the delayed model from step n0 to step n1 
+using the ring buffer of delay_buffer. At every step the new phases overwrite 
+the oldest column of the buffer, in place, and the new head is returned. As in 
+Euler, RK2 and RK4, the delayed phases are those of the beginning of the step. 
+The noise only covers the chunk, so memory does not grow with the length of 
+the run.
+
+Parameters 
+    -------------
+    function kuramoto_delay
+    history: Ring buffer of the past phases (see delay_buffer)
+    head: Column of history holding the phases at t[n0]
+    n0, n1: Indices of the first and last time of the integration
+    N: Total number of oscillators.
+    t: Time interval for simulation   
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    M: Number of neighbouring oscillators
+    noise: Guassian white noise of the chunk, NumPy array of shape (N,n1-n0) 
+           whose column n-n0 is used at step n, or None for no noise
+    K: Coupling Matrix
+    tau: Delay Matrix
+    alpha: Dephasing Matrix
+    
+Returns 
+    -------------
+    head: Column of history holding the phases at t[n1]; the current phases 
+          are history[:,head]
+'''
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def check_noise(noise,N,n0,n1):
+    
+    '''
+    Raises ValueError unless noise is None or holds the N values of each of 
+    the n1-n0 steps of the chunk.
+    '''
+    
+    if noise is not None:
+        if noise.shape[0] != N or noise.shape[1] < n1-n0:
+            raise ValueError('noise must be None or an (N,n1-n0) array for the chunk')
+
+
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def Euler_delay(f,history,head,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha):
+    
+    L = history.shape[1]
+    check_noise(noise,N,n0,n1)
+    zero = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta_n = history[:,head]
+        eta = zero if noise is None else noise[:,n-n0]
+        theta_new = theta_n+f(theta_n,t[n],eta,history,head,N,M,w,kappa,K,tau,alpha)*delta_t
+        head = (head+1)%L
+        history[:,head] = theta_new
+        
+    return head
+
+
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def RK2_delay(f,history,head,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha):
+    
+    L = history.shape[1]
+    check_noise(noise,N,n0,n1)
+    zero = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta_n = history[:,head]
+        eta = zero if noise is None else noise[:,n-n0]
+        k1 = f(theta_n,t[n],eta,history,head,N,M,w,kappa,K,tau,alpha)
+        k2 = f(theta_n+k1*delta_t/2,t[n]+delta_t/2,eta,history,head,N,M,w,kappa,K,tau,alpha)
+        theta_new = theta_n+k2*delta_t
+        head = (head+1)%L
+        history[:,head] = theta_new
+        
+    return head
+
+
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def RK4_delay(f,history,head,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha):
+    
+    L = history.shape[1]
+    check_noise(noise,N,n0,n1)
+    zero = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta_n = history[:,head]
+        eta = zero if noise is None else noise[:,n-n0]
+        k1 = f(theta_n,t[n],eta,history,head,N,M,w,kappa,K,tau,alpha)
+        k2 = f(theta_n+ k1*delta_t/2,t[n]+ delta_t/2,eta,history,head,N,M,w,kappa,K,tau,alpha)
+        k3 = f(theta_n+ k2*delta_t/2,t[n]+ delta_t/2,eta,history,head,N,M,w,kappa,K,tau,alpha)
+        k4 = f(theta_n+ k3*delta_t,t[n]+ delta_t,eta,history,head,N,M,w,kappa,K,tau,alpha)
+        theta_new = theta_n+(k1+2*k2+2*k3+k4)*(delta_t/6)
+        head = (head+1)%L
+        history[:,head] = theta_new
+        
+    return head
+
+
+
+#FUNCTIONS FOR NUMERICAL INTEGRATION OF THE NOISY DELAYED MODEL
+'''
+The noise of kuramoto is added to the deterministic right hand side without 
+any sqrt(delta_t) scaling and has to be precomputed as an (N,len(t)) array. 
+These integrators treat it as a proper stochastic term 
+d(theta) = f(theta,t) dt + sqrt(2D) dW: f is evaluated without noise (eta = 0) 
+and the Gaussian increments of variance 2*D*delta_t are the standard normals 
+of the chunk, given as an (n1-n0,N) array (drawn from a NumPy Generator by 
+stream.integrate_delay), scaled by sqrt(2*D*delta_t). Euler_Maruyama_delay 
+is the Euler-Maruyama scheme and Heun_delay the stochastic Heun scheme; both 
+use the ring buffer of delay_buffer like Euler_delay.
+
+Parameters 
+    -------------
+    function kuramoto_delay
+    history: Ring buffer of the past phases (see delay_buffer)
+    head: Column of history holding the phases at t[n0]
+    n0, n1: Indices of the first and last time of the integration
+    N: Total number of oscillators.
+    t: Time interval for simulation   
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    M: Number of neighbouring oscillators
+    D: Noise intensity
+    K: Coupling Matrix
+    tau: Delay Matrix
+    alpha: Dephasing Matrix
+    normals: NumPy array of shape (n1-n0,N) of standard normals
+    
+Returns 
+    -------------
+    head: Column of history holding the phases at t[n1]
+'''
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def Euler_Maruyama_delay(f,history,head,n0,n1,N,t,w,kappa,M,D,K,tau,alpha,normals):
+    
+    L = history.shape[1]
+    eta = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        xi = np.sqrt(2*D*delta_t)*normals[n-n0]
+        theta_n = history[:,head]
+        theta_new = theta_n+f(theta_n,t[n],eta,history,head,N,M,w,kappa,K,tau,alpha)*delta_t+xi
+        head = (head+1)%L
+        history[:,head] = theta_new
+        
+    return head
+
+
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def Heun_delay(f,history,head,n0,n1,N,t,w,kappa,M,D,K,tau,alpha,normals):
+    
+    L = history.shape[1]
+    eta = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        xi = np.sqrt(2*D*delta_t)*normals[n-n0]
+        theta_n = history[:,head]
+        k1 = f(theta_n,t[n],eta,history,head,N,M,w,kappa,K,tau,alpha)
+        k2 = f(theta_n+k1*delta_t+xi,t[n+1],eta,history,head,N,M,w,kappa,K,tau,alpha)
+        theta_new = theta_n+(k1+k2)*(delta_t/2)+xi
+        head = (head+1)%L
+        history[:,head] = theta_new
+        
+    return head
+
+
+
+#FUNCTIONS FOR DELAYS IN TIME UNITS (DELAY DIFFERENTIAL EQUATION MODE)
+'''
+In kuramoto and kuramoto_delay the delays tau[i][j] are integer numbers of 
+steps, so that the physical delay changes with the time step. Here the delays 
+are given in time units and the delayed phases theta_j(t - tau[i][j]) are 
+interpolated from a compact history buffer, the tuple
+
+    times: NumPy array of length L, the times of the stored points
+    values: NumPy array of shape (L,N), the phases at these times (time-major)
+    slopes: NumPy array of shape (L,N), their time derivatives
+    head: Row of the buffer holding the latest point
+    tail: Row of the buffer holding the oldest point still needed
+
+The rows from tail to head form a ring, and the phases between two points 
+are given by the cubic Hermite interpolant of their values and slopes. Every 
+step appends its point at head and evicts, from the tail, the points older 
+than the last one at or before t - max(tau), which is all the history the 
+delays can reach. When the ring is full the arrays are reallocated with twice 
+as many rows, so the steps may be refined, non-uniform or chosen on the fly 
+(adaptive) without touching tau or knowing the smallest step in advance. The 
+buffer holds the points of the last max(tau) of the run plus two, and its 
+length L is at most twice the largest number of such points over the run. A 
+delayed time later than the latest point, which happens for delays shorter 
+than the step, is extrapolated linearly from it.
+
+'''
+def random_delays(N,tau_max):
+    
+    '''
+    Continuous version of the delay matrix of random_values.
+    
+    Parameters:
+        -----------------
+        N: Total number of oscillators.
+        tau_max: Largest delay, in time units
+        
+    Returns 
+        -------------
+        tau: NumPy array of shape (N,N) uniform on [0,tau_max)
+        
+    '''
+    
+    return np.random.uniform(0,tau_max,size=(N,N))
+
+
+def dde_buffer(phi,t0,tau,dt):
+    
+    '''
+    Builds the history buffer of the delayed model from the initial history, 
+    sampled every dt over [t0 - max(tau), t0].
+    
+    Parameters:
+        -----------------
+        phi: Initial history, function of the time returning the N phases 
+             (e.g. lambda s: theta_0 for a constant history)
+        t0: Initial time; the current phases are phi(t0)
+        tau: Delay Matrix, in time units
+        dt: Spacing of the samples of the initial history (e.g. the first step)
+        
+    Returns 
+        -------------
+        times, values, slopes, head, tail: History buffer (see above)
+        
+    '''
+    
+    L = int(np.ceil(np.max(tau)/dt))+2
+    times = t0-dt*np.arange(L-1,-1,-1.0)
+    values = np.array([phi(s) for s in times],dtype=np.float64)
+    slopes = np.gradient(values,times,axis=0) if L > 2 else np.zeros_like(values)
+    
+    return times,values,slopes,L-1,0
+
+
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def dde_interpolate(times,values,slopes,head,tail,s,j):
+    
+    '''
+    Phase of the oscillator j at the time s from the history buffer.
+    
+    Parameters:
+        -----------------
+        times, values, slopes, head, tail: History buffer
+        s: Time, at most max(tau) before the latest point
+        j: Index of the oscillator
+        
+    Returns 
+        -------------
+        theta_j: Cubic Hermite interpolation of the phase at time s
+        
+    '''
+    
+    L = len(times)
+    if s >= times[head]:
+        return values[head,j]+(s-times[head])*slopes[head,j]
+    
+    # Bisection on the age a of the points (row (head-a)%L, older for larger a)
+    lo = 0
+    hi = (head-tail)%L
+    while hi-lo > 1:
+        mid = (lo+hi)//2
+        if times[(head-mid)%L] > s:
+            lo = mid
+        else:
+            hi = mid
+    b = (head-lo)%L
+    a = (head-hi)%L
+    
+    h = times[b]-times[a]
+    x = (s-times[a])/h
+    if x < 0.0:
+        x = 0.0
+    h00 = (1+2*x)*(1-x)*(1-x)
+    h10 = x*(1-x)*(1-x)
+    h01 = x*x*(3-2*x)
+    h11 = x*x*(x-1)
+    
+    return h00*values[a,j]+h10*h*slopes[a,j]+h01*values[b,j]+h11*h*slopes[b,j]
+
+
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def kuramoto_dde(theta_i,time,eta,times,values,slopes,head,tail,N,M,w,kappa,K,tau,alpha):
+    
+    '''
+    Same model as kuramoto_delay with the delays tau[i][j] in time units: the 
+    neighbours i-p and i+p (p = 1,...,M-1, open chain) enter through their 
+    phases at time - tau[i][j], interpolated from the history buffer.
+    
+    Parameters:
+        -----------------
+        theta_i: Theta value at the time of the working of the integrator
+        time: Time value for the working of the integrator
+        eta: Guassian white noise
+        times, values, slopes, head, tail: History buffer (see dde_buffer)
+        N: Total number of oscillators.
+        M: Number of neighbouring oscillators
+        w: Providing random natural frequencies between 0 and 1
+        kappa: Critical coupling value
+        K: Coupling Matrix
+        tau: Delay Matrix, in time units
+        alpha: Dephasing Matrix
+        
+    Returns 
+        -------------
+        theta_dot : NumPy array with the first order derivative of the Input theta values
+        
+    '''
+    
+    theta_dot = np.zeros(N)
+    
+    for i in range(0,N):
+        sum_ = 0.0
+        for p in range(1,M):
+            for j in (i-p,i+p):
+                if (j>=0 and j<N):
+                    theta_j = dde_interpolate(times,values,slopes,head,tail,time-tau[i][j],j)
+                    sum_ += kappa*np.sin(theta_j-theta_i[i]+alpha[i][j])
+                    
+        theta_dot[i] = w[i] + (1/N)*sum_ + eta[i]
+        
+    return theta_dot
+
+
+
+#FUNCTIONS FOR NUMERICAL INTEGRATION IN DELAY DIFFERENTIAL EQUATION MODE
+'''
+Euler, RK2 and RK4 integration of the model with delays in time units, from 
+step n0 to step n1 of t, which may be non-uniform. Every step appends the new 
+phases to the history buffer, with the last stage as provisional slope, and 
+the slope of the latest point is replaced by the exact one at the beginning 
+of the next step, except at t[0] where the solution generally has a kink and 
+the slope of the initial history is kept. The delayed phases of the 
+intermediate stages are taken at their own times. The buffer is updated in 
+place, except when it has to grow, so the buffer returned must be used from 
+then on:
+
+    buffer = dde_buffer(phi,t[0],tau,t[1]-t[0])
+    buffer = RK4_dde(kuramoto_dde,*buffer,0,len(t)-1,N,t,w,kappa,M,None,K,tau,alpha)
+    theta = buffer[1][buffer[3]]
+
+Parameters 
+    -------------
+    function kuramoto_dde
+    times, values, slopes, head, tail: History buffer (see dde_buffer) at t[n0]
+    n0, n1: Indices of the first and last time of the integration
+    N: Total number of oscillators.
+    t: Time interval for simulation   
+    w: Providing random natural frequencies between 0 and 1
+    kappa: Critical coupling value
+    M: Number of neighbouring oscillators
+    noise: Guassian white noise of the chunk, NumPy array of shape (N,n1-n0) 
+           whose column n-n0 is used at step n, or None for no noise
+    K: Coupling Matrix
+    tau: Delay Matrix, in time units
+    alpha: Dephasing Matrix
+    
+Returns 
+    -------------
+    times, values, slopes, head, tail: History buffer at t[n1]; the current 
+                                       phases are values[head]
+'''
+@jit(nopython=True,cache=True)# Imported from Numba module to decrease runtime
+def dde_append(times,values,slopes,head,tail,time,theta,slope,tau_max):
+    
+    '''
+    Appends the point (time, theta, slope) to the history buffer, evicts the 
+    points that no delay can reach any more and doubles the buffer if it is 
+    full. Returns the buffer (times, values, slopes, head, tail).
+    '''
+    
+    L = len(times)
+    
+    # Keep the last point at or before time - tau_max and everything after it
+    while (head-tail)%L > 0 and times[(tail+1)%L] <= time-tau_max:
+        tail = (tail+1)%L
+        
+    if (head+1)%L == tail:
+        count = (head-tail)%L+1
+        times_new = np.zeros(2*L)
+        values_new = np.zeros((2*L,values.shape[1]))
+        slopes_new = np.zeros((2*L,values.shape[1]))
+        for a in range(0,count):
+            times_new[a] = times[(tail+a)%L]
+            values_new[a] = values[(tail+a)%L]
+            slopes_new[a] = slopes[(tail+a)%L]
+        times,values,slopes = times_new,values_new,slopes_new
+        head,tail = count-1,0
+        L = 2*L
+    
+    head = (head+1)%L
+    times[head] = time
+    values[head] = theta
+    slopes[head] = slope
+    
+    return times,values,slopes,head,tail
+
+
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def Euler_dde(f,times,values,slopes,head,tail,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha):
+    
+    tau_max = np.max(tau)
+    check_noise(noise,N,n0,n1)
+    zero = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta_n = values[head].copy()
+        eta = zero if noise is None else noise[:,n-n0]
+        k1 = f(theta_n,t[n],eta,times,values,slopes,head,tail,N,M,w,kappa,K,tau,alpha)
+        if n > 0:
+            slopes[head] = k1
+        times,values,slopes,head,tail = dde_append(times,values,slopes,head,tail,t[n+1],
+                                                   theta_n+k1*delta_t,k1,tau_max)
+        
+    return times,values,slopes,head,tail
+
+
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def RK2_dde(f,times,values,slopes,head,tail,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha):
+    
+    tau_max = np.max(tau)
+    check_noise(noise,N,n0,n1)
+    zero = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta_n = values[head].copy()
+        eta = zero if noise is None else noise[:,n-n0]
+        k1 = f(theta_n,t[n],eta,times,values,slopes,head,tail,N,M,w,kappa,K,tau,alpha)
+        if n > 0:
+            slopes[head] = k1
+        k2 = f(theta_n+k1*delta_t/2,t[n]+delta_t/2,eta,times,values,slopes,head,tail,
+               N,M,w,kappa,K,tau,alpha)
+        times,values,slopes,head,tail = dde_append(times,values,slopes,head,tail,t[n+1],
+                                                   theta_n+k2*delta_t,k2,tau_max)
+        
+    return times,values,slopes,head,tail
+
+
+@jit(nopython=True)# Imported from Numba module to decrease runtime
+def RK4_dde(f,times,values,slopes,head,tail,n0,n1,N,t,w,kappa,M,noise,K,tau,alpha):
+    
+    tau_max = np.max(tau)
+    check_noise(noise,N,n0,n1)
+    zero = np.zeros(N)
+    
+    for n in range(n0,n1):
+        delta_t = t[n+1]-t[n]
+        theta_n = values[head].copy()
+        eta = zero if noise is None else noise[:,n-n0]
+        k1 = f(theta_n,t[n],eta,times,values,slopes,head,tail,N,M,w,kappa,K,tau,alpha)
+        if n > 0:
+            slopes[head] = k1
+        k2 = f(theta_n+ k1*delta_t/2,t[n]+ delta_t/2,eta,times,values,slopes,head,tail,
+               N,M,w,kappa,K,tau,alpha)
+        k3 = f(theta_n+ k2*delta_t/2,t[n]+ delta_t/2,eta,times,values,slopes,head,tail,
+               N,M,w,kappa,K,tau,alpha)
+        k4 = f(theta_n+ k3*delta_t,t[n]+ delta_t,eta,times,values,slopes,head,tail,
+               N,M,w,kappa,K,tau,alpha)
+        theta_new = theta_n+(k1+2*k2+2*k3+k4)*(delta_t/6)
+        times,values,slopes,head,tail = dde_append(times,values,slopes,head,tail,t[n+1],
+                                                   theta_new,k4,tau_max)
+        
+    return times,values,slopes,head,tail
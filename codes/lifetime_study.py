@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:40:08 2026
+
+@author: nehabinish
+"""
+
+import argparse
+import csv
+import multiprocessing
+
+import numpy as np
+
+import chimera
+import compiled
+import kuramoto_alpha
+import stream
+
+
+'''
+Study of the lifetime of chimera states against the number of oscillators N. 
+Every (N, seed) pair is one long streaming run of the nonlocally coupled ring 
+(kuramoto_alpha.kuramoto_fft with a cosine kernel and phase lag alpha, the 
+setting of Abrams and Strogatz) watched by a chimera.Detector. A run ends as 
+soon as the chimera has collapsed, or at tf. The runs are spread over a 
+process pool, the largest N first, since they are the longest and should not 
+be left for the end. The lifetimes are written as one row per run, together 
+with a summary of their distribution for every N.
+
+Usage from the command line:
+
+    python lifetime_study.py --N 64 128 256 --seeds 20 --tf 10000 --output lifetimes.csv
+
+'''
+
+FIELDS = ('N','seed','t_formed','t_collapsed','collapsed_to','lifetime','t_end')
+SUMMARY_FIELDS = ('N','runs','formed','collapsed','lifetime_mean','lifetime_median','lifetime_std')
+
+
+# FUNCTION TO DRAW THE INITIAL PHASES OF A RUN
+def initial_phases(N,seed):
+    
+    '''
+    Initial phases favouring a chimera: half of the ring nearly in phase and 
+    the other half random.
+    
+    Parameters
+    ----------
+    N: Total number of oscillators.
+    seed: Seed of the random numbers
+    
+    Returns
+    -------
+    theta: NumPy array of length N
+    
+    '''
+    
+    rng = np.random.default_rng(seed)
+    theta = rng.uniform(0,2*np.pi,N)
+    theta[:N//2] = rng.normal(0,0.1,N//2)
+    
+    return theta
+
+
+
+# FUNCTION TO RUN ONE (N, SEED) JOB
+def run_job(job):
+    
+    '''
+    Integrates one ring until its chimera collapses and returns its lifetime.
+    
+    Parameters
+    ----------
+    job: Tuple (N,seed,options) where options is a dictionary with the keys 
+         tf, dt, every, kappa, alpha, A, M, z_min, omega_tol, transient
+    
+    Returns
+    -------
+    row: Dictionary with the fields of FIELDS
+    
+    '''
+    
+    N,seed,options = job
+    
+    t = np.arange(0,options['tf']+options['dt']/2,options['dt'])
+    w = np.zeros(N)
+    G_hat = kuramoto_alpha.ring_kernel(N,'cosine',A=options['A'])
+    M = max(1,int(options['M']*N))
+    
+    detector = chimera.Detector(M,z_min=options['z_min'],omega_tol=options['omega_tol'],
+                                t_start=options['transient'],stop_on_collapse=True)
+    stream.integrate(compiled.RK4_steps,kuramoto_alpha.kuramoto_fft,t,initial_phases(N,seed),
+                     N,M,w,options['kappa'],(G_hat,options['alpha']),
+                     observers=(detector,),every=options['every'])
+    
+    collapsed_to = None if detector.collapsed_to is None else chimera.STATES[detector.collapsed_to]
+    
+    return {'N':N,'seed':seed,'t_formed':detector.t_formed,'t_collapsed':detector.t_collapsed,
+            'collapsed_to':collapsed_to,'lifetime':detector.lifetime,
+            't_end':detector.t[-1] if len(detector.t) else t[0]}
+
+
+
+# FUNCTION TO RUN THE STUDY
+def study(Ns,seeds,options,processes=None,output=None):
+    
+    '''
+    Runs every (N, seed) job over a process pool, the largest N first.
+    
+    Parameters
+    ----------
+    Ns: Iterable of numbers of oscillators
+    seeds: Iterable of integer seeds
+    options: Dictionary of the parameters of the runs, see run_job
+    processes: Number of worker processes (default: all the cores)
+    output: Optional path of the CSV file of the runs; the summary is 
+            written next to it with the suffix _summary
+    
+    Returns
+    -------
+    rows: List of dictionaries, one per run, sorted by N and seed
+    
+    '''
+    
+    jobs = [(int(N),int(seed),options) for N in sorted(Ns,reverse=True) for seed in seeds]
+    
+    with multiprocessing.Pool(processes) as pool:
+        rows = list(pool.imap_unordered(run_job,jobs,chunksize=1))
+        
+    rows.sort(key=lambda row: (row['N'],row['seed']))
+    
+    if output is not None:
+        write_table(rows,FIELDS,output)
+        base = output[:-4] if output.endswith('.csv') else output
+        write_table(summary(rows),SUMMARY_FIELDS,base+'_summary.csv')
+        
+    return rows
+
+
+
+# FUNCTION TO SUMMARISE THE LIFETIMES FOR EVERY N
+def summary(rows):
+    
+    '''
+    Distribution of the lifetimes for every N. Runs whose chimera never formed 
+    or never collapsed before tf are counted but left out of the statistics.
+    
+    Parameters
+    ----------
+    rows: List of dictionaries returned by study
+    
+    Returns
+    -------
+    summary: List of dictionaries with the fields of SUMMARY_FIELDS
+    
+    '''
+    
+    result = []
+    for N in sorted(set(row['N'] for row in rows)):
+        runs = [row for row in rows if row['N']==N]
+        lifetime = np.array([row['lifetime'] for row in runs if row['lifetime'] is not None])
+        result.append({'N':N,'runs':len(runs),
+                       'formed':sum(row['t_formed'] is not None for row in runs),
+                       'collapsed':len(lifetime),
+                       'lifetime_mean':np.mean(lifetime) if len(lifetime) else None,
+                       'lifetime_median':np.median(lifetime) if len(lifetime) else None,
+                       'lifetime_std':np.std(lifetime) if len(lifetime) else None})
+        
+    return result
+
+
+
+# FUNCTION TO WRITE A RESULTS TABLE
+def write_table(rows,fields,output):
+    
+    with open(output,'w',newline='') as file:
+        writer = csv.DictWriter(file,fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+
+def main():
+    
+    parser = argparse.ArgumentParser(description='Lifetime of chimera states against N')
+    parser.add_argument('--N',type=int,nargs='+',default=(64,128,256),help='numbers of oscillators')
+    parser.add_argument('--seeds',type=int,default=20,help='number of seeds per N')
+    parser.add_argument('--tf',type=float,default=10000,help='maximum duration of a run')
+    parser.add_argument('--dt',type=float,default=0.05,help='time step')
+    parser.add_argument('--every',type=int,default=20,help='steps between two detections')
+    parser.add_argument('--kappa',type=float,default=1.0,help='coupling value')
+    parser.add_argument('--alpha',type=float,default=np.pi/2-0.1,help='phase lag')
+    parser.add_argument('--A',type=float,default=0.995,help='modulation of the cosine kernel')
+    parser.add_argument('--M',type=float,default=0.05,help='half width of the local windows, as a fraction of N')
+    parser.add_argument('--z-min',type=float,default=0.9,help='threshold of the local order parameter')
+    parser.add_argument('--omega-tol',type=float,default=0.05,help='tolerance of the frequency plateaus')
+    parser.add_argument('--transient',type=float,default=100,help='time before the detection starts')
+    parser.add_argument('--processes',type=int,default=None,help='number of worker processes')
+    parser.add_argument('--output',default='lifetimes.csv',help='CSV file of the runs')
+    options = parser.parse_args()
+    
+    run_options = {'tf':options.tf,'dt':options.dt,'every':options.every,'kappa':options.kappa,
+                   'alpha':options.alpha,'A':options.A,'M':options.M,'z_min':options.z_min,
+                   'omega_tol':options.omega_tol,'transient':options.transient}
+    
+    study(options.N,range(options.seeds),run_options,options.processes,options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -178,4 +178,20 @@ plot_integrators.plot_RK2(theta_RK2_new,N,t)
 plot_integrators.plot_RK4(theta_RK4_new,N,t)
 
 
+ #%%
+ 
+# Ensemble of B realisations advanced together, one kappa and one seed per member
+
+import ensemble
+
+B = 8
+seeds = np.arange(0,B,1)
+kappa_b = np.full(B,45.0)
+
+theta_b,w_b = ensemble.initial_values(B,N,t,seeds)
+theta_b,omega_b = ensemble.RK4(kuramoto_alpha.kuramoto_sparse,t,theta_b,N,M,w_b,kappa_b,
+                               kuramoto_alpha.neighbour_list(N,M))
+theta_b_mod = theta_b%(2*np.pi)
+
+
  #%%
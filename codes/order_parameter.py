@@ -9,6 +9,7 @@ Created on Sat Nov  7 20:44:44 2020
 
 import numpy as np
 import matplotlib.pyplot as plt
+from numba import jit
 
 
 # FUNCTION TO COMPUTE ORDER PARAMETERS 'R' AND 'PHI'
@@ -20,18 +21,19 @@ def order(theta,N,t):
    
     Parameters
     ----------
-    theta : ndarray of shape (N,len(t))
+    theta : ndarray of shape (N,len(t)), or (B,N,len(t)) for an ensemble
     N: Total number of oscillators.
     t: Time interval for simulation
     
     Returns
     -------
-    r: NumPy array of magnitude R
+    r: NumPy array of magnitude R (shape (len(t),) or (B,len(t)))
     phi: NumPy array of average phase 
+    z: NumPy array of the complex order parameter
     
     See Also 
     -------
-     np.zeros: Return a new array of given shape and type, filled with zeros(used for intilisation)
+     order_sums: Compiled kernel computing the sums of cos and sin of the phases
      
      numpy.angle(z, deg=False)
      Return the angle of the complex argument.
@@ -40,23 +42,163 @@ def order(theta,N,t):
   
     """
 
-    r = np.zeros(len(t))
-    phi = np.zeros(len(t))
-    z= np.zeros(len(t),dtype = complex)
-    sum_order = 0
+    theta = np.asarray(theta,dtype=float)
+    
+    if theta.ndim == 3:
+        z = np.zeros((theta.shape[0],theta.shape[2]),dtype = complex)
+        for b in range(0,theta.shape[0]):
+            C,S = order_sums(theta[b])
+            z[b] = (C+1j*S)/N
+    else:
+        C,S = order_sums(theta)
+        z = (C+1j*S)/N
         
-    for n in range(0,len(t)):
-        sum_order = np.sum(np.exp(theta[:,n]*1j))
-        eq = (1/N)*sum_order
-        z[n]=eq
-        r[n] = np.absolute(eq)#R(t) given by the absolute value 
-        phi[n] = np.angle(eq) #phi(t) given angle of the complex sum value.
-     
-    print(type(r),type(phi),type(z)) #Checking the type of the return parameters.
+    r = np.absolute(z) #R(t) given by the absolute value 
+    phi = np.angle(z) #phi(t) given angle of the complex sum value.
+    
     return r,phi,z    
 
 
 
+# COMPILED KERNELS OF THE ORDER PARAMETER
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def order_sums(theta):
+    
+    '''
+    Sums of cos(theta_i) and sin(theta_i) over the oscillators for every time 
+    of theta (shape (N,len(t))), without building the complex exponentials. 
+    The rows are read contiguously.
+    '''
+    
+    N,T = theta.shape
+    C = np.zeros(T)
+    S = np.zeros(T)
+    
+    for i in range(0,N):
+        for n in range(0,T):
+            C[n] += np.cos(theta[i,n])
+            S[n] += np.sin(theta[i,n])
+            
+    return C,S
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def order_now(theta):
+    
+    '''
+    Complex order parameter of a single snapshot of the phases (length N). 
+    This is the incremental update used by the streaming observers.
+    '''
+    
+    C = 0.0
+    S = 0.0
+    for i in range(0,len(theta)):
+        C += np.cos(theta[i])
+        S += np.sin(theta[i])
+        
+    return (C+1j*S)/len(theta)
+
+
+@jit(nopython=True,cache=True) # Imported from Numba module to decrease runtime
+def local_order_now(theta,M):
+    
+    '''
+    Local order parameter of a single snapshot of the phases (length N), see 
+    local_order. The window sums are moved along the ring, adding one 
+    oscillator and removing one, so the cost is O(N) whatever M.
+    '''
+    
+    N = len(theta)
+    C = np.cos(theta)
+    S = np.sin(theta)
+    R = np.zeros(N)
+    
+    width = min(2*M+1,N)
+    c = 0.0
+    s = 0.0
+    for k in range(-M,-M+width): # window of the oscillator 0
+        c += C[k%N]
+        s += S[k%N]
+    
+    for i in range(0,N):
+        R[i] = np.sqrt(c*c+s*s)/width
+        if width < N:
+            c += C[(i+M+1)%N]-C[(i-M)%N]
+            s += S[(i+M+1)%N]-S[(i-M)%N]
+            
+    return R
+
+
+
+# FUNCTION TO COMPUTE THE LOCAL ORDER PARAMETER
+
+def local_order(theta,M):
+
+    """ 
+    Computes the local order parameter of every oscillator, the modulus of the 
+    complex average over its 2M+1 neighbourhood on the ring,
+    
+        Z_i(t) = |1/(2M+1) * sum_{|j-i|<=M} exp(i*theta_j(t))|,
+        
+    which is close to 1 in coherent regions and small in incoherent ones. 
+    When 2M+1 > N the neighbourhood is the whole ring, every oscillator 
+    counted once, as in the local entropy of shannon_entropy.
+   
+    Parameters
+    ----------
+    theta : ndarray of shape (N,len(t)), or of length N for a single time
+    M: Number of neighbouring oscillators on each side
+    
+    Returns
+    -------
+    Z: NumPy array of the same shape as theta
+  
+    """
+    
+    theta = np.asarray(theta,dtype=float)
+    if theta.ndim == 1:
+        return local_order_now(theta,M)
+    
+    Z = np.zeros(theta.shape)
+    for n in range(0,theta.shape[1]):
+        Z[:,n] = local_order_now(np.ascontiguousarray(theta[:,n]),M)
+        
+    return Z
+
+
+
+
+# FUNCTION TO COMPUTE THE ORDER PARAMETERS OF A TRAJECTORY STORED ON DISK
+
+def order_store(path,size=1024):
+
+    """ 
+    Same as order, for a trajectory written with trajectory_store. The phases 
+    are read chunk by chunk, so the trajectory never has to fit in memory.
+   
+    Parameters
+    ----------
+    path: Directory of the store
+    size: Number of times read per chunk
+    
+    Returns
+    -------
+    r: NumPy array of magnitude R
+    phi: NumPy array of average phase 
+    z: NumPy array of the complex order parameter
+  
+    """
+    
+    import trajectory_store
+    
+    theta,t,meta = trajectory_store.load(path)
+    z = np.zeros(len(t),dtype = complex)
+    
+    for n0,t_chunk,theta_chunk in trajectory_store.chunks(path,size):
+        z[n0:n0+len(t_chunk)] = order(theta_chunk,meta['N'],t_chunk)[2]
+        
+    return np.absolute(z),np.angle(z),z
 
 
 # FUNCION TO PLOT ORDER PARAMETERS t-->r(t) and t-->\phi(t)
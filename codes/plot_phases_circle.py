@@ -215,3 +215,44 @@ def density_graph(theta,N,t):
 
 
 
+# FUNCTION TO REPRESENT A TRAJECTORY STORED ON DISK ON A CIRCLE
+def circle_graph_store(path,Time):
+    
+    """ 
+    Same as circle_graph_2 for a trajectory written with trajectory_store; 
+    only the phases at the given times are read from disk.
+   
+    Parameters
+    ----------
+    path: Directory of the store
+    Time: Given time for which theta values are plotted (the nearest 
+          stored sample is used).
+    
+    """
+    
+    import trajectory_store
+    
+    theta,t = trajectory_store.select(path,Time)
+    circle_graph_2(theta%(2*np.pi),theta.shape[0],t,t)
+    
+    
+    
+# FUNCTION TO DRAW THE DENSITY GRAPH OF A TRAJECTORY STORED ON DISK
+def density_graph_store(path,stride=1):
+    
+    """ 
+    Same as density_graph for a trajectory written with trajectory_store, 
+    reading only every stride-th stored time.
+   
+    Parameters
+    ----------
+    path: Directory of the store
+    stride: Step between two plotted times
+    
+    """
+    
+    import trajectory_store
+    
+    theta,t,meta = trajectory_store.load(path)
+    theta = np.array(theta[::stride]).T
+    density_graph(theta%(2*np.pi),meta['N'],t[::stride])
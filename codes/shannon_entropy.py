@@ -9,15 +9,30 @@ Created on Sat Nov  7 18:37:42 2020
 import numpy as np
 import matplotlib.pyplot as plt
 import numba
-from numba import jit
+from numba import jit, prange
 
 
 # Function to calculate the entropy.
-jit(nopython=True) # To enhance the speed and decrease runtime 
-def Shannon_entropy(theta_i,N,t,M):
+@jit(nopython=True,parallel=True,cache=True) # To enhance the speed and decrease runtime 
+def Shannon_entropy(theta_i,N,t,M,q=0,sliding=True):
     
     """ 
     Computes the local Shannon entropy for all the oscillators
+    
+    The circle is divided into q sectors [2*pi*a/q, 2*pi*(a+1)/q) and p_a is the 
+    fraction of the 2M+1 oscillators k = i-M,...,i+M (closed chain, modulo N) 
+    whose phase lies in sector a. When 2M+1 > N the window is the whole ring, 
+    every oscillator counted once, as in order_parameter.local_order. The 
+    local entropy of oscillator i is
+    
+        S_i = - sum_a p_a * log(p_a)
+        
+    which is 0 when the whole neighbourhood is in one sector (coherent) and 
+    at most log(min(q,2M+1,N)) when it is spread out (incoherent). Every 
+    neighbourhood is binned with a single histogram pass and the time slices 
+    are computed in parallel. With sliding=True (default) the histogram is 
+    moved along the ring instead (entropy_sliding), so the cost per time 
+    slice is O(N) whatever M.
    
     Parameters
     ----------
@@ -25,6 +40,8 @@ def Shannon_entropy(theta_i,N,t,M):
     N: Total number of oscillators.
     t: Time interval for simulation
     M: Total number of neighbouring oscillators.
+    q: Number of sectors, 2M+1 by default (q=0)
+    sliding: Use the incremental sliding window (entropy_sliding)
     
     Returns
     -------
@@ -32,69 +49,171 @@ def Shannon_entropy(theta_i,N,t,M):
     
     See Also 
     -------
-     np.zeros: Return a new array of given shape and type, filled with zeros(used for intilisation)
-     
-     numpy.floor: Return the floor of the input, element-wise.
-                    The floor of the scalar x is the largest integer i, 
-                    such that i <= x. It is often denoted as \lfloor x \rfloor.
-                    
-     
-     astype(data_type): to change the data type of a numpy array
+     entropy_now: Local Shannon entropy of a single time slice.
      
-     numpy.absolute: Calculate the absolute value element-wise.
+     numba.prange: Parallel loop over the time slices.
   
     """
     
-    q=np.zeros((N,len(t)))
-    q[:,0] = (2*M)+1 #Setting intial maximum elongation as the total reach of an oscillator
-    
+    S = np.zeros((N,len(t)))
     
-    for n in range (1,len(t)-1): #Finding the rest of the q values
-        q[:,n] = q[:,0]*np.cos(theta_i[:,n])
+    for n in prange(0,len(t)):
+        if sliding:
+            S[:,n] = entropy_sliding(theta_i[:,n],M,q)
+        else:
+            S[:,n] = entropy_now(theta_i[:,n],M,q)
+       
+    return S
 
 
-    q = np.floor(q) #Rounding the elongation value
-    q = q.astype(int) #Converting float values to int so it can be provided in a range
-    q = np.absolute(q) # Finding absolute values of q
-    q[q==0]=2 #Setting the minimun elongation of q as 2
+
+# Function to calculate the entropy of a single time slice.
+@jit(nopython=True,cache=True) # To enhance the speed and decrease runtime 
+def entropy_now(theta,M,q=0):
     
-    print("q")
-    print(q)
+    """ 
+    Local Shannon entropy of every oscillator for one snapshot of the phases 
+    (length N), see Shannon_entropy. Used by stream.Entropy during a run.
     
-    S = np.zeros((N,len(t)))
+    Parameters
+    ----------
+    theta : Phases of the oscillators, NumPy array of length N
+    M: Total number of neighbouring oscillators.
+    q: Number of sectors, 2M+1 by default (q=0)
+    
+    Returns
+    -------
+    S: NumPy array containing the local Shannon entropy of all the oscillators 
     
-    a = 0
+    """
     
-
-    theta_k = np.zeros(N)
+    N = len(theta)
+    if q <= 0:
+        q = (2*M)+1
     
-    for n in range(0,len(t)):
-        for i in range (0,N):
+    sector = np.zeros(N,dtype=np.int64) # sector of every oscillator
+    for k in range(0,N):
+        a = int((theta[k]%(2*np.pi))*q/(2*np.pi))
+        sector[k] = min(a,q-1)
+        
+    width = min((2*M)+1,N) # the whole ring, each oscillator once, if 2M+1 > N
+    hist = np.zeros(q,dtype=np.int64)
+    S = np.zeros(N)
+    
+    for i in range(0,N):
+        hist[:] = 0
+        for k in range(i-M,i-M+width): #Neighbouring oscillators, closed chain
+            hist[sector[k%N]] += 1
+        for a in range(0,q):
+            if hist[a] > 0:
+                p_a = hist[a]/width
+                S[i] += - p_a * np.log(p_a)
             
-            for k in np.arange(i-M,i+M,1): #Checking the neighbouring oscillators, Here, closed chain
-                
-                if (i+M > N): # Modulo N since it's a closed chain.
-                    k = (i+M)%N
-                           
-                    if (theta_i[k][n] >=(2*np.pi*a/q[i][n])) and (theta_i[k][n]<= (2*np.pi*(a+1)/q[i][n])):
-                        theta_k[k] = theta_i[k][n]
-                    
-                else:
-                    #Checking if theta_k falls in this set of values
-                    if ((2*np.pi*a/q[i][n]) <= (theta_i[k][n])) and ((theta_i[k][n])<= (2*np.pi*(a+1)/q[i][n])):
-                        theta_k[k]=theta_i[k][n]
-                        
-            p_a = len(theta_k)/((2*M)+1) #Calculating probability to be the fraction of oscillators with phase in range(2*np.pi*a/q[i][n],2*np.pi*(a+1)/q[i][n])
+    return S
 
-            
-            for p in range(a,q[i][n]-1):
-                S[i][n] += - p_a * np.log(p_a)  
-                                  
-       
+   
+    
+
+# Function to calculate the entropy of a single time slice with a sliding window.
+@jit(nopython=True,cache=True) # To enhance the speed and decrease runtime 
+def entropy_sliding(theta,M,q=0):
+    
+    """ 
+    Same as entropy_now, but the windows of neighbouring oscillators, which 
+    differ by only two oscillators, are not rebuilt: the sector histogram is 
+    moved along the ring, adding the oscillator i+M+1 and removing i-M at 
+    every shift. With W = min(2M+1,N) and h_a the counts of the sectors,
+    
+        S_i = log(W) - (1/W) * sum_a h_a*log(h_a)
+        
+    and only the two terms of the sum that change are updated, so the cost 
+    is O(N+q) whatever M.
+    
+    Parameters
+    ----------
+    theta : Phases of the oscillators, NumPy array of length N
+    M: Total number of neighbouring oscillators.
+    q: Number of sectors, 2M+1 by default (q=0)
+    
+    Returns
+    -------
+    S: NumPy array containing the local Shannon entropy of all the oscillators 
+    
+    """
+    
+    N = len(theta)
+    if q <= 0:
+        q = (2*M)+1
+    width = min((2*M)+1,N) # the whole ring, each oscillator once, if 2M+1 > N
+    
+    sector = np.zeros(N,dtype=np.int64) # sector of every oscillator
+    for k in range(0,N):
+        a = int((theta[k]%(2*np.pi))*q/(2*np.pi))
+        sector[k] = min(a,q-1)
+    
+    hlogh = np.zeros(width+2) # table of h*log(h), a count reaches W+1 during a shift
+    for h in range(1,width+2):
+        hlogh[h] = h*np.log(h)
+        
+    hist = np.zeros(q,dtype=np.int64)
+    H = 0.0
+    for k in range(-M,-M+width): # window of the oscillator 0
+        a = sector[k%N]
+        H += hlogh[hist[a]+1]-hlogh[hist[a]]
+        hist[a] += 1
+    
+    S = np.zeros(N)
+    for i in range(0,N):
+        S[i] = np.log(width)-H/width
+        if width == N:
+            continue # the window is the whole ring and does not move
+        
+        a = sector[(i+M+1)%N] # oscillator entering the window
+        H += hlogh[hist[a]+1]-hlogh[hist[a]]
+        hist[a] += 1
+        a = sector[(i-M)%N] # oscillator leaving the window
+        H += hlogh[hist[a]-1]-hlogh[hist[a]]
+        hist[a] -= 1
+        
+    return S
+
+
+# Function to calculate the entropy of a trajectory stored on disk.
+def Shannon_entropy_store(path,M,size=256):
+    
+    """ 
+    Same as Shannon_entropy, for a trajectory written with trajectory_store. 
+    The phases are read chunk by chunk and the entropies are written into 
+    S.npy, a memory-mapped array of shape (N,len(t)) in the same directory.
+   
+    Parameters
+    ----------
+    path: Directory of the store
+    M: Total number of neighbouring oscillators.
+    size: Number of times read per chunk
+    
+    Returns
+    -------
+    S: Memory-mapped NumPy array containing the local Shannon entropy of all the oscillators 
+    
+    """
+    
+    import os
+    import trajectory_store
+    
+    theta,t,meta = trajectory_store.load(path)
+    N = meta['N']
+    S = np.lib.format.open_memmap(os.path.join(path,'S.npy'),mode='w+',dtype=float,shape=(N,len(t)))
+    
+    for n0,t_chunk,theta_chunk in trajectory_store.chunks(path,size):
+        S[:,n0:n0+len(t_chunk)] = Shannon_entropy(theta_chunk%(2*np.pi),N,t_chunk,M)
+        
+    S.flush()
     return S
    
     
 
+
 # Function to draw 1-D graph for Shannon entropy
 
 def oneD_graph(S,N,t,Time_,i):
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:20:51 2026
+
+@author: nehabinish
+"""
+
+import os
+import pickle
+import sys
+
+import numpy as np
+
+import order_parameter
+import shannon_entropy
+
+
+'''
+Streaming integration of the Kuramoto model. Instead of storing theta as an 
+(N,len(t)) array, only the current phases are kept in memory and a list of 
+observers is called every `every` steps with (n, t[n], theta). Every observer 
+accumulates what it needs on the fly, so memory is O(N) instead of O(N*len(t)) 
+and arbitrarily long runs are possible.
+
+An observer is any callable observer(n,time,theta); the classes below cover 
+the analyses of main.py.
+
+    import kuramoto_alpha, stream
+    
+    r = stream.OrderParameter()
+    omega = stream.MeanVelocity()
+    theta = stream.integrate(kuramoto_alpha.RK4_steps,kuramoto_alpha.kuramoto_sparse,
+                             t,theta0,N,M,w,kappa,kuramoto_alpha.neighbour_list(N,M),
+                             observers=(r,omega),every=10)
+
+'''
+
+
+# FUNCTION FOR STREAMING NUMERICAL INTEGRATION
+def integrate(steps,f,t,theta,N,M,w,kappa,args=(),observers=(),every=1,
+              checkpoint=None,checkpoint_every=None,rng=None,**options):
+    
+    '''
+    Integrates the Kuramoto model keeping only the current state.
+
+    Parameters 
+        -------------
+        steps: Stepping scheme, kuramoto_alpha.Euler_steps, RK2_steps, RK4_steps,
+               Euler_Maruyama_steps or Heun_steps
+        function: kuramoto (any right hand side of kuramoto_alpha)
+        t: Time interval for simulation
+        theta: Initial values of theta, NumPy array of length N
+        N: Total number of oscillators.
+        M: Number of neighbouring oscillators
+        w: Providing random natural frequencies between 0 and 1
+        kappa: Critical coupling value
+        args: Tuple of extra arguments passed on to the function after kappa
+        observers: Callables observer(n,time,theta) called at t[0] and every
+                   `every` steps (and at the last time). The run stops early 
+                   as soon as an observer has a true `done` attribute.
+        every: Number of integration steps between two calls of the observers
+        checkpoint: Optional path of a checkpoint file, see save_checkpoint
+        checkpoint_every: Minimum number of steps between two checkpoints
+        rng: NumPy Generator (np.random.default_rng(seed)) drawing the 
+             standard normals of the stochastic schemes, which are passed to 
+             steps chunk by chunk; None for the deterministic schemes. The 
+             same seed gives the same noise as kuramoto_alpha.Euler_Maruyama 
+             and Heun.
+        options: Keyword arguments passed on to steps (e.g. the noise intensity D)
+        
+    Returns 
+        -------------
+        theta: NumPy array with the phases at the final time t[-1] (or at 
+               the time the run was stopped)
+
+    '''
+    
+    run = {'kind':'phases','steps':steps,'f':f,'t':t,'N':N,'M':M,'w':w,'kappa':kappa,
+           'args':args,'options':options,'every':every,'rng':rng,
+           'checkpoint':checkpoint,'checkpoint_every':checkpoint_every}
+    state = {'n':0,'theta':np.array(theta,dtype=float)}
+    
+    return _run(run,state,observers)['theta']
+
+
+
+# FUNCTION FOR STREAMING NUMERICAL INTEGRATION OF THE DELAYED MODEL
+def integrate_delay(steps,f,t,history,head,N,M,w,kappa,K,tau,alpha,noise,observers=(),every=1,
+                    checkpoint=None,checkpoint_every=None,rng=None):
+    
+    '''
+    Same as integrate for the delayed model of kuramoto_modified. The state is 
+    the ring buffer of delay_buffer, and the observers receive the current 
+    phases history[:,head].
+
+    Parameters 
+        -------------
+        steps: kuramoto_modified.Euler_delay, RK2_delay, RK4_delay, 
+               Euler_Maruyama_delay or Heun_delay
+        function: kuramoto_modified.kuramoto_delay
+        t: Time interval for simulation
+        history, head: Ring buffer returned by kuramoto_modified.delay_buffer
+        N, M, w, kappa, K, tau, alpha: See kuramoto_modified.kuramoto_delay
+        noise: None for no noise, an (N,len(t)) Guassian white noise array 
+               of which the columns of every chunk are passed on to steps, 
+               or the noise intensity D for the stochastic schemes
+        observers, every, checkpoint, checkpoint_every, rng: See integrate
+        
+    Returns 
+        -------------
+        history: Ring buffer at the final time t[-1]
+        head: Column of history holding the final phases
+
+    '''
+    
+    run = {'kind':'delay','steps':steps,'f':f,'t':t,'N':N,'M':M,'w':w,'kappa':kappa,
+           'K':K,'tau':tau,'alpha':alpha,'noise':noise,'every':every,'rng':rng,
+           'checkpoint':checkpoint,'checkpoint_every':checkpoint_every}
+    state = {'n':0,'history':np.array(history,dtype=float),'head':head}
+    state = _run(run,state,observers)
+    
+    return state['history'],state['head']
+
+
+
+def _phases(run,state):
+    if run['kind'] == 'delay':
+        return state['history'][:,state['head']]
+    return state['theta']
+
+
+def _advance(run,state,n0,n1):
+    # The normals of the stochastic schemes are drawn here, one chunk at a time
+    normals = () if run.get('rng') is None else (run['rng'].standard_normal((n1-n0,run['N'])),)
+    if run['kind'] == 'delay':
+        noise = run['noise']
+        if isinstance(noise,np.ndarray):
+            noise = noise[:,n0:n1]
+        state['head'] = run['steps'](run['f'],state['history'],state['head'],n0,n1,run['N'],run['t'],
+                                     run['w'],run['kappa'],run['M'],noise,run['K'],run['tau'],
+                                     run['alpha'],*normals)
+    else:
+        options = run['options'] if run.get('rng') is None else dict(run['options'],normals=normals[0])
+        state['theta'] = run['steps'](run['f'],run['t'],state['theta'],n0,n1,run['N'],run['M'],
+                                      run['w'],run['kappa'],run['args'],**options)
+
+
+def _run(run,state,observers):
+    
+    # Shared loop of integrate, integrate_delay and resume
+    t = run['t']
+    n = state['n']
+    last_checkpoint = n
+    
+    if n == 0:
+        for observer in observers:
+            observer(0,t[0],_phases(run,state))
+    
+    while n < len(t)-1:
+        n1 = min(n+run['every'],len(t)-1)
+        _advance(run,state,n,n1)
+        n = n1
+        state['n'] = n
+        for observer in observers:
+            observer(n,t[n],_phases(run,state))
+        if any(getattr(observer,'done',False) for observer in observers):
+            break # an observer asked to end the run early
+        if run['checkpoint'] is not None and n-last_checkpoint >= (run['checkpoint_every'] or 1):
+            save_checkpoint(run['checkpoint'],run,state,observers)
+            last_checkpoint = n
+            
+    return state
+
+
+
+# FUNCTION TO SAVE THE STATE OF A STREAMING RUN
+def save_checkpoint(path,run,state,observers):
+    
+    '''
+    Writes everything needed to continue a run bit for bit: the parameters of 
+    the run, with the NumPy Generator of the noise and hence its state, the 
+    current phases (or ring buffer of the delays), the step index and the 
+    observers with what they have accumulated. The file is written next to the old one and then 
+    renamed, so a crash while saving never leaves a broken checkpoint. It is 
+    called by integrate and integrate_delay every checkpoint_every steps.
+    
+    Parameters
+    ----------
+    path: Path of the checkpoint file
+    run: Dictionary of the parameters of the run
+    state: Dictionary of the current state of the run
+    observers: Observers of the run
+    
+    See Also
+    -------
+    pickle: The checkpoint is a pickle; the numba functions in it are stored 
+            by reference and have to be importable when resuming.
+    
+    '''
+    
+    checkpoint = {'run':run,'state':state,'observers':list(observers)}
+    
+    with open(path+'.tmp','wb') as file:
+        pickle.dump(checkpoint,file,protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path+'.tmp',path)
+
+
+
+# FUNCTION TO RESUME A STREAMING RUN FROM A CHECKPOINT
+def resume(path):
+    
+    '''
+    Continues a run from the checkpoint written by save_checkpoint, with the 
+    same parameters, random numbers and observers, and keeps checkpointing 
+    into the same file. Running 
+    
+        python stream.py checkpoint.pkl 
+        
+    from the codes directory does the same from the command line.
+    
+    Parameters
+    ----------
+    path: Path of the checkpoint file
+    
+    Returns
+    -------
+    state: Dictionary with the final state ('theta' or 'history' and 'head')
+    observers: List of the observers of the run
+    
+    '''
+    
+    with open(path,'rb') as file:
+        checkpoint = pickle.load(file)
+        
+    run = checkpoint['run']
+    run['checkpoint'] = path
+    
+    state = _run(run,checkpoint['state'],checkpoint['observers'])
+    
+    return state,checkpoint['observers']
+
+
+
+# OBSERVER OF THE ORDER PARAMETERS
+class OrderParameter:
+    
+    '''
+    Records the order parameters R(t) and phi(t) of order_parameter.order at 
+    every call.
+    
+    Attributes
+    ----------
+    t: NumPy array of the observed times
+    r: NumPy array of magnitude R
+    phi: NumPy array of average phase
+    z: NumPy array of the complex order parameter
+    
+    '''
+    
+    def __init__(self):
+        self._t = []
+        self._z = []
+        
+    def __call__(self,n,time,theta):
+        self._t.append(time)
+        self._z.append(order_parameter.order_now(theta))
+        
+    @property
+    def t(self):
+        return np.array(self._t)
+    
+    @property
+    def z(self):
+        return np.array(self._z,dtype=complex)
+    
+    @property
+    def r(self):
+        return np.absolute(self.z)
+    
+    @property
+    def phi(self):
+        return np.angle(self.z)
+    
+    
+
+# OBSERVER OF THE LOCAL ORDER PARAMETER
+class LocalOrderParameter:
+    
+    '''
+    Records the local order parameter (order_parameter.local_order) of every 
+    oscillator over its 2M+1 neighbourhood at every call.
+    
+    Attributes
+    ----------
+    t: NumPy array of the observed times
+    Z: NumPy array of shape (N,len(t)) with the local order parameters
+    
+    '''
+    
+    def __init__(self,M):
+        self.M = M
+        self._t = []
+        self._Z = []
+        
+    def __call__(self,n,time,theta):
+        self._t.append(time)
+        self._Z.append(order_parameter.local_order_now(theta,self.M))
+        
+    @property
+    def t(self):
+        return np.array(self._t)
+    
+    @property
+    def Z(self):
+        return np.array(self._Z).T
+    
+
+
+# OBSERVER OF THE MEAN VELOCITIES OF THE OSCILLATORS
+class MeanVelocity:
+    
+    '''
+    Time averaged velocity of every oscillator, (theta_i(t) - theta_i(t_start))
+    / (t - t_start), as plotted by chimera.omega_graph. Observations before 
+    t_start (the transient) are ignored. The instantaneous mean velocity 
+    over the oscillators between two calls is recorded as well.
+    
+    Attributes
+    ----------
+    omega: NumPy array of length N with the time averaged velocities
+    t: NumPy array of the observed times
+    mean: NumPy array of the velocity averaged over the oscillators between 
+          two successive calls
+    
+    '''
+    
+    def __init__(self,t_start=None):
+        self.t_start = t_start
+        self._first = None
+        self._last = None
+        self._t = []
+        self._mean = []
+        
+    def __call__(self,n,time,theta):
+        if self.t_start is not None and time < self.t_start:
+            return
+        if self._first is None:
+            self._first = (time,theta.copy())
+        else:
+            last_time,last_theta = self._last
+            self._t.append(time)
+            self._mean.append(np.mean(theta-last_theta)/(time-last_time))
+        self._last = (time,theta.copy())
+    
+    @property
+    def omega(self):
+        if self._first is None or self._last[0] == self._first[0]:
+            return None
+        return (self._last[1]-self._first[1])/(self._last[0]-self._first[0])
+    
+    @property
+    def t(self):
+        return np.array(self._t)
+    
+    @property
+    def mean(self):
+        return np.array(self._mean)
+    
+
+
+# OBSERVER OF THE LOCAL SHANNON ENTROPY
+class Entropy:
+    
+    '''
+    Local Shannon entropy of every oscillator (shannon_entropy.entropy_sliding) 
+    over its 2M+1 neighbourhood and q sectors (2M+1 by default) at every call.
+    
+    Attributes
+    ----------
+    t: NumPy array of the observed times
+    S: NumPy array of shape (N,len(t)) with the local Shannon entropies
+    
+    '''
+    
+    def __init__(self,N,M,q=0):
+        self.N = N
+        self.M = M
+        self.q = q
+        self._t = []
+        self._S = []
+        
+    def __call__(self,n,time,theta):
+        S = shannon_entropy.entropy_sliding(theta,self.M,self.q)
+        self._t.append(time)
+        self._S.append(S)
+        
+    @property
+    def t(self):
+        return np.array(self._t)
+    
+    @property
+    def S(self):
+        return np.array(self._S).T
+    
+    
+
+# OBSERVER KEEPING SNAPSHOTS OF THE PHASES
+class Snapshots:
+    
+    '''
+    Keeps a copy of the phases (modulo 2pi) at every call. Combine with a 
+    large `every` in integrate to keep only a few snapshots of a long run.
+    
+    Attributes
+    ----------
+    t: NumPy array of the observed times
+    theta: NumPy array of shape (N,len(t)) with the phases modulo 2pi
+    
+    '''
+    
+    def __init__(self):
+        self._t = []
+        self._theta = []
+        
+    def __call__(self,n,time,theta):
+        self._t.append(time)
+        self._theta.append(theta%(2*np.pi))
+        
+    @property
+    def t(self):
+        return np.array(self._t)
+    
+    @property
+    def theta(self):
+        return np.array(self._theta).T
+
+
+if __name__ == '__main__':
+    resume(sys.argv[1])
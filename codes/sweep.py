@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:15 2026
+
+@author: nehabinish
+"""
+
+import argparse
+import csv
+import multiprocessing
+
+import numpy as np
+
+import compiled
+import kuramoto_alpha
+import ensemble
+
+
+'''
+Sweep of the coupling strength kappa to locate the synchronisation transition.
+Every (kappa, seed) pair is an independent job; the jobs are spread over a
+process pool, every worker integrates past the transient and then reduces
+r(t) to a few summary statistics as it goes, holding only the current phases
+(O(N) memory whatever the length of t), and only those numbers are sent back
+and written as one row per job in a CSV table.
+
+Usage from the command line:
+
+    python sweep.py --kappa 0 10 50 --seeds 100 --N 200 --output sweep.csv
+
+'''
+
+FIELDS = ('kappa','seed','N','M','coupling','r_mean','r_std','r_final')
+
+
+# FUNCTION TO RUN ONE (KAPPA, SEED) JOB
+def run_job(job):
+    
+    '''
+    Integrates one realisation with RK4 and reduces it to the statistics of 
+    the order parameter after the transient, accumulated step by step.
+    
+    Parameters
+    ----------
+    job: Tuple (kappa,seed,N,M,t,transient,coupling) where
+         kappa: Coupling value
+         seed: Seed of the initial phases and natural frequencies
+         N: Total number of oscillators.
+         M: Number of neighbouring oscillators
+         t: Time interval for simulation
+         transient: Time after which r(t) is averaged
+         coupling: 'sparse' (open chain of kuramoto), 'ring' (closed ring) 
+                   or 'global' (all-to-all mean field)
+    
+    Returns
+    -------
+    row: Dictionary with the fields of FIELDS
+    
+    '''
+    
+    kappa,seed,N,M,t,transient,coupling = job
+    
+    theta,w = ensemble.initial_state(N,seed)
+    
+    if coupling == 'global':
+        f,args = kuramoto_alpha.kuramoto_global,(0.0,)
+    elif coupling in ('sparse','ring'):
+        f,args = kuramoto_alpha.kuramoto_sparse,kuramoto_alpha.neighbour_list(N,M,coupling=='ring')
+    else:
+        raise ValueError("unknown coupling '{}'".format(coupling))
+    
+    # the transient in one go, then one step at a time so that only the 
+    # current phases are held; r(t) is accumulated as it comes (Welford)
+    n0 = int(np.searchsorted(t,transient))
+    if n0 > 0:
+        theta = compiled.RK4_steps(f,t,theta,0,min(n0,len(t)-1),N,M,w,kappa,args)
+    
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    r = np.nan
+    for n in range(n0,len(t)):
+        if n > n0:
+            theta = compiled.RK4_steps(f,t,theta,n-1,n,N,M,w,kappa,args)
+        r = np.absolute(np.mean(np.exp(theta*1j)))
+        count += 1
+        delta = r-mean
+        mean += delta/count
+        m2 += delta*(r-mean)
+    
+    if count == 0:
+        mean = m2 = np.nan
+        count = 1
+    
+    return {'kappa':kappa,'seed':seed,'N':N,'M':M,'coupling':coupling,
+            'r_mean':mean,'r_std':np.sqrt(m2/count),'r_final':r}
+
+
+
+# FUNCTION TO SWEEP KAPPA OVER A GRID AND A SET OF SEEDS
+def sweep(kappas,seeds,N,M,t,transient,coupling='global',processes=None,output=None):
+    
+    '''
+    Runs every (kappa, seed) job over a process pool.
+    
+    Parameters
+    ----------
+    kappas: Iterable of coupling values
+    seeds: Iterable of integer seeds
+    N: Total number of oscillators.
+    M: Number of neighbouring oscillators
+    t: Time interval for simulation
+    transient: Time after which r(t) is averaged
+    coupling: 'sparse', 'ring' or 'global', see run_job
+    processes: Number of worker processes (default: all the cores)
+    output: Optional path of the CSV file the table is written to
+    
+    Returns
+    -------
+    rows: List of dictionaries, one per job, sorted by kappa and seed
+    
+    See Also
+    -------
+    multiprocessing.Pool.imap_unordered: Distributes the jobs and yields 
+                                         results as soon as they are done.
+    
+    '''
+    
+    jobs = [(float(kappa),int(seed),N,M,t,transient,coupling) for kappa in kappas for seed in seeds]
+    
+    with multiprocessing.Pool(processes) as pool:
+        rows = list(pool.imap_unordered(run_job,jobs))
+        
+    rows.sort(key=lambda row: (row['kappa'],row['seed']))
+    
+    if output is not None:
+        write_table(rows,output)
+        
+    return rows
+
+
+
+# FUNCTION TO WRITE THE RESULTS TABLE
+def write_table(rows,output):
+    
+    '''
+    Writes the rows of a sweep as a CSV table with one line per job.
+    
+    Parameters
+    ----------
+    rows: List of dictionaries with the fields of FIELDS
+    output: Path of the CSV file
+    
+    '''
+    
+    with open(output,'w',newline='') as file:
+        writer = csv.DictWriter(file,fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+
+# FUNCTION TO AVERAGE THE SWEEP OVER THE SEEDS
+def r_curve(rows):
+    
+    '''
+    Averages the steady state order parameter over the seeds to obtain the 
+    R_inf(kappa) curve.
+    
+    Parameters
+    ----------
+    rows: List of dictionaries returned by sweep
+    
+    Returns
+    -------
+    kappa: NumPy array of the coupling values
+    r_inf: NumPy array of the mean of r_mean over the seeds
+    r_err: NumPy array of the standard error of r_mean over the seeds
+    
+    '''
+    
+    kappa = np.unique([row['kappa'] for row in rows])
+    r_inf = np.zeros(len(kappa))
+    r_err = np.zeros(len(kappa))
+    
+    for n in range(0,len(kappa)):
+        r = np.array([row['r_mean'] for row in rows if row['kappa']==kappa[n]])
+        r_inf[n] = np.mean(r)
+        r_err[n] = np.std(r)/np.sqrt(len(r))
+        
+    return kappa,r_inf,r_err
+
+
+
+def main():
+    
+    parser = argparse.ArgumentParser(description='Sweep of the coupling strength of the Kuramoto model')
+    parser.add_argument('--kappa',type=float,nargs=3,default=(0,10,50),metavar=('MIN','MAX','POINTS'),
+                        help='grid of coupling values, as for np.linspace')
+    parser.add_argument('--seeds',type=int,default=100,help='number of seeds per coupling value')
+    parser.add_argument('--N',type=int,default=200,help='total number of oscillators')
+    parser.add_argument('--M',type=int,default=6,help='number of neighbouring oscillators')
+    parser.add_argument('--tf',type=float,default=100,help='end of time interval')
+    parser.add_argument('--step',type=int,default=2000,help='total number of values in the time interval')
+    parser.add_argument('--transient',type=float,default=50,help='time after which r(t) is averaged')
+    parser.add_argument('--coupling',choices=('global','sparse','ring'),default='global')
+    parser.add_argument('--processes',type=int,default=None,help='number of worker processes')
+    parser.add_argument('--output',default='sweep.csv',help='CSV file of the results')
+    options = parser.parse_args()
+    
+    kappas = np.linspace(options.kappa[0],options.kappa[1],int(options.kappa[2]))
+    t = np.linspace(0,options.tf,options.step)
+    
+    sweep(kappas,range(options.seeds),options.N,options.M,t,options.transient,
+          options.coupling,options.processes,options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import domain
+import kuramoto_alpha
+
+
+def _initial(N,seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0,2*np.pi,N),rng.uniform(-1,1,N)
+
+
+@pytest.mark.parametrize('workers',[1,2,3])
+@pytest.mark.parametrize('closed',[True,False])
+def test_rk4_equals_serial_bit_for_bit(workers,closed):
+    N,M = 37,4
+    t = np.linspace(0,1,21)
+    theta0,w = _initial(N)
+
+    theta = np.zeros((N,len(t)))
+    theta[:,0] = theta0
+    serial,omega_k = kuramoto_alpha.RK4(kuramoto_alpha.kuramoto_sparse,t,theta,N,M,w,2.0,
+                                        kuramoto_alpha.neighbour_list(N,M,closed))
+
+    result = domain.RK4(t,theta0,N,M,w,2.0,closed=closed,workers=workers,every=4)
+
+    assert np.array_equal(result,serial[:,::4])
+
+
+def test_killed_worker_does_not_hang():
+    N,M = 60,3
+    t = np.linspace(0,1000,1000001) # far longer than the test
+    theta0,w = _initial(N)
+
+    def kill_a_worker():
+        while not multiprocessing.active_children():
+            time.sleep(0.01)
+        time.sleep(0.5)
+        os.kill(multiprocessing.active_children()[0].pid,signal.SIGKILL)
+
+    def hung(signum,frame):
+        raise AssertionError('domain.RK4 hung after a worker was killed')
+
+    previous = signal.signal(signal.SIGALRM,hung)
+    signal.alarm(60)
+    killer = threading.Thread(target=kill_a_worker)
+    killer.start()
+    try:
+        with pytest.raises(RuntimeError,match='failed'):
+            domain.RK4(t,theta0,N,M,w,2.0,workers=3)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM,previous)
+        killer.join()
+    
+    assert not multiprocessing.active_children()
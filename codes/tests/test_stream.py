@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+import kuramoto_alpha
+import kuramoto_modified
+import stream
+
+
+STOP = None
+
+class Interrupt:
+    
+    # Observer ending the run at step STOP, as a crash would
+    def __call__(self,n,time,theta):
+        if STOP is not None and n >= STOP:
+            raise KeyboardInterrupt
+
+
+def _phases(N,seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0,2*np.pi,N),rng.uniform(-1,1,N)
+
+
+def _interrupted(run,path):
+    # runs until STOP, then resumes from the last checkpoint
+    global STOP
+    STOP = 23
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            run(path)
+    finally:
+        STOP = None
+    state,observers = stream.resume(path)
+    return state,observers
+
+
+def _compare(observers,reference):
+    for observer,expected in zip(observers,reference):
+        if isinstance(observer,stream.OrderParameter):
+            assert np.array_equal(observer.t,expected.t)
+            assert np.array_equal(observer.z,expected.z)
+        if isinstance(observer,stream.Snapshots):
+            assert np.array_equal(observer.theta,expected.theta)
+
+
+@pytest.mark.parametrize('scheme',['RK4_steps','Heun_steps','Euler_Maruyama_steps'])
+def test_resume_is_bit_exact(tmp_path,scheme):
+    N,M = 21,3
+    t = np.linspace(0,2,41)
+    theta0,w = _phases(N)
+    args = kuramoto_alpha.neighbour_list(N,M,True)
+    steps = getattr(kuramoto_alpha,scheme)
+    options = {} if scheme == 'RK4_steps' else {'D':0.1}
+    
+    def run(path):
+        observers = (stream.OrderParameter(),stream.Snapshots(),Interrupt())
+        rng = None if scheme == 'RK4_steps' else np.random.default_rng(5)
+        theta = stream.integrate(steps,kuramoto_alpha.kuramoto_sparse,t,theta0,N,M,w,2.0,args,
+                                 observers=observers,every=2,checkpoint=path,checkpoint_every=4,
+                                 rng=rng,**options)
+        return theta,observers
+    
+    theta,reference = run(str(tmp_path/'reference.pkl'))
+    state,observers = _interrupted(run,str(tmp_path/'run.pkl'))
+    
+    assert np.array_equal(state['theta'],theta)
+    _compare(observers,reference)
+
+
+@pytest.mark.parametrize('scheme',['RK4_delay','Heun_delay'])
+def test_resume_delay_is_bit_exact(tmp_path,scheme):
+    N,M = 15,3
+    t = np.linspace(0,2,41)
+    theta0,w = _phases(N)
+    rng = np.random.default_rng(1)
+    K = np.ones((N,N))
+    tau = rng.integers(0,5,size=(N,N))
+    alpha = rng.uniform(0,1,size=(N,N))
+    stochastic = scheme == 'Heun_delay'
+    
+    def run(path):
+        observers = (stream.OrderParameter(),Interrupt())
+        noise = 0.1 if stochastic else None
+        rng = np.random.default_rng(5) if stochastic else None
+        history,head = kuramoto_modified.delay_buffer(theta0,tau)
+        steps,f = getattr(kuramoto_modified,scheme),kuramoto_modified.kuramoto_delay
+        history,head = stream.integrate_delay(steps,f,t,history,head,N,M,w,2.0,K,tau,alpha,noise,
+                                              observers=observers,every=2,checkpoint=path,
+                                              checkpoint_every=4,rng=rng)
+        return {'history':history,'head':head},observers
+    
+    final,reference = run(str(tmp_path/'reference.pkl'))
+    state,observers = _interrupted(run,str(tmp_path/'run.pkl'))
+    
+    assert np.array_equal(state['history'][:,state['head']],final['history'][:,final['head']])
+    _compare(observers,reference)
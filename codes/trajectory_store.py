@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:05:33 2026
+
+@author: nehabinish
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+'''
+On-disk store for trajectories that do not fit in memory. A store is a 
+directory holding
+
+    theta.npy : phases, memory-mapped .npy file of shape (len(t),N). It is 
+                stored time-major so that a block of consecutive times is 
+                contiguous on disk and can be written and read in one piece.
+    t.npy     : times of the samples
+    meta.json : N, number of samples (and number of samples actually 
+                written) and the parameters of the run (kappa, M, seed, ...)
+
+The phases are written chunk by chunk with Writer, which is an observer of 
+stream.integrate, and are read back lazily with chunks, which yields blocks 
+in the (N,len(t)) layout used everywhere else:
+
+    writer = trajectory_store.Writer('run',N,t,every,kappa=kappa,M=M,seed=seed)
+    stream.integrate(kuramoto_alpha.RK4_steps,f,t,theta0,N,M,w,kappa,args,
+                     observers=(writer,),every=every)
+    writer.close()
+    
+    r,phi,z = order_parameter.order_store('run')
+
+'''
+
+
+# FUNCTION GIVING THE STEPS AT WHICH stream.integrate CALLS ITS OBSERVERS
+def sample_indices(t,every=1):
+    
+    '''
+    Indices of t at which stream.integrate calls its observers: every 
+    `every` steps from t[0], and t[-1] at the end of the run even when 
+    (len(t)-1) is not a multiple of every.
+    
+    Parameters
+    ----------
+    t: Time interval for simulation
+    every: Number of steps between two calls
+    
+    Returns
+    -------
+    index: NumPy array of the indices of the samples
+    
+    '''
+    
+    index = np.arange(0,len(t),every)
+    if index[-1] != len(t)-1:
+        index = np.append(index,len(t)-1)
+        
+    return index
+
+
+
+# FUNCTION TO CREATE AN EMPTY STORE
+def create(path,N,t,every=1,**meta):
+    
+    '''
+    Creates the directory of a store and allocates the memory-mapped phases 
+    for the samples t[sample_indices(t,every)], which include t[-1].
+    
+    Parameters
+    ----------
+    path: Directory of the store
+    N: Total number of oscillators.
+    t: Time interval for simulation
+    every: Number of steps between two samples
+    meta: Parameters of the run saved in meta.json (kappa, M, seed, ...)
+    
+    Returns
+    -------
+    theta: Writable memory-mapped NumPy array of shape (samples,N)
+    
+    See Also
+    -------
+    numpy.lib.format.open_memmap: Open a .npy file as a memory-mapped array.
+    
+    '''
+    
+    os.makedirs(path,exist_ok=True)
+    samples = np.asarray(t,dtype=float)[sample_indices(t,every)]
+    
+    _write_meta(path,dict(meta,N=int(N),every=int(every),samples=len(samples),written=0))
+    np.save(os.path.join(path,'t.npy'),samples)
+    
+    return np.lib.format.open_memmap(os.path.join(path,'theta.npy'),mode='w+',
+                                     dtype=float,shape=(len(samples),N))
+
+
+def _write_meta(path,meta):
+    # written next to the old file and renamed, as the checkpoints of stream
+    file_path = os.path.join(path,'meta.json')
+    with open(file_path+'.tmp','w') as file:
+        json.dump(meta,file,indent=2,default=float)
+    os.replace(file_path+'.tmp',file_path)
+
+
+
+# FUNCTION TO OPEN A STORE
+def load(path,mode='r'):
+    
+    '''
+    Opens a store without reading the phases into memory. Only the samples 
+    actually written are returned, so a run that ended early (an observer 
+    was done) gives a shorter store.
+    
+    Parameters
+    ----------
+    path: Directory of the store
+    mode: Mode of the memory map, 'r' (read-only) or 'r+' (read-write)
+    
+    Returns
+    -------
+    theta: Memory-mapped NumPy array of shape (len(t),N)
+    t: NumPy array of the times of the samples
+    meta: Dictionary of the parameters of the run
+    
+    '''
+    
+    with open(os.path.join(path,'meta.json')) as file:
+        meta = json.load(file)
+        
+    written = meta.get('written',meta['samples'])
+    t = np.load(os.path.join(path,'t.npy'))[:written]
+    theta = np.load(os.path.join(path,'theta.npy'),mmap_mode=mode)[:written]
+    
+    return theta,t,meta
+
+
+
+# FUNCTION TO READ A STORE CHUNK BY CHUNK
+def chunks(path,size=1024):
+    
+    '''
+    Reads the phases of a store by blocks of consecutive times. Only one 
+    block is in memory at a time.
+    
+    Parameters
+    ----------
+    path: Directory of the store
+    size: Number of times per block
+    
+    Yields
+    -------
+    n0: Index of the first time of the block
+    t: NumPy array of the times of the block
+    theta: NumPy array of shape (N,len(t)) with the phases of the block
+    
+    '''
+    
+    theta,t,meta = load(path)
+    
+    for n0 in range(0,len(t),size):
+        n1 = min(n0+size,len(t))
+        yield n0,t[n0:n1],np.array(theta[n0:n1]).T
+
+
+
+# FUNCTION TO READ A FEW TIMES OF A STORE
+def select(path,Time):
+    
+    '''
+    Reads the phases of a store at the given times only.
+    
+    Parameters
+    ----------
+    path: Directory of the store
+    Time: Times to read (the nearest sample is taken)
+    
+    Returns
+    -------
+    theta: NumPy array of shape (N,len(Time)) with the phases
+    t: NumPy array of the times of the selected samples
+    
+    '''
+    
+    theta,t,meta = load(path)
+    index = [int(np.argmin(np.abs(t-time))) for time in Time]
+    
+    return np.array(theta[index]).T,t[index]
+
+
+
+# OBSERVER WRITING THE PHASES INTO A STORE
+class Writer:
+    
+    '''
+    Observer of stream.integrate writing the phases into a new store. The 
+    samples are gathered in an in-memory block of `chunk` times which is 
+    flushed to the memory map when full, so the disk is written in large 
+    contiguous pieces. It must be called at the steps of sample_indices(t,every), 
+    i.e. given to stream.integrate with the same t and every; the time of 
+    every call is the one recorded in t.npy, and a call at any other step, or 
+    beyond the last sample, raises a ValueError. Every flush records the 
+    number of samples written in meta.json, so the store of a run that 
+    crashed loads up to its last flush. Call close at the end of the run to 
+    flush the last block.
+    
+    Parameters
+    ----------
+    path: Directory of the store
+    N: Total number of oscillators.
+    t: Time interval for simulation
+    every: Number of steps between two calls, as given to stream.integrate
+    chunk: Number of times per block
+    meta: Parameters of the run saved in meta.json (kappa, M, seed, ...)
+    
+    '''
+    
+    def __init__(self,path,N,t,every=1,chunk=256,**meta):
+        self.path = path
+        self.index = sample_indices(t,every)
+        self.theta = create(path,N,t,every,**meta)
+        self.t = np.load(os.path.join(path,'t.npy'),mmap_mode='r+')
+        with open(os.path.join(path,'meta.json')) as file:
+            self.meta = json.load(file)
+        self.block = np.zeros((min(chunk,len(self.index)),N))
+        self.times = np.zeros(len(self.block))
+        self.n0 = 0 # index of the first sample of the block
+        self.k = 0 # number of samples in the block
+        
+    def __call__(self,n,time,theta):
+        sample = self.n0+self.k
+        if sample >= len(self.index):
+            raise ValueError('the store of {} samples is full'.format(len(self.index)))
+        if n != self.index[sample]:
+            raise ValueError('call at step {}, the store expects step {}'.format(n,self.index[sample]))
+        self.block[self.k] = theta
+        self.times[self.k] = time
+        self.k += 1
+        if self.k == len(self.block):
+            self.flush()
+            
+    def flush(self):
+        self.theta[self.n0:self.n0+self.k] = self.block[:self.k]
+        self.t[self.n0:self.n0+self.k] = self.times[:self.k]
+        self.n0 += self.k
+        self.k = 0
+        self.theta.flush()
+        self.t.flush()
+        self.meta['written'] = self.n0 # only once the samples are on disk
+        _write_meta(self.path,self.meta)
+        
+    def close(self):
+        self.flush()
+        
+    def __getstate__(self):
+        # The memory maps are reopened instead of being pickled with the 
+        # checkpoints of stream.save_checkpoint
+        state = self.__dict__.copy()
+        del state['theta'],state['t']
+        return state
+    
+    def __setstate__(self,state):
+        self.__dict__.update(state)
+        self.theta = np.load(os.path.join(self.path,'theta.npy'),mmap_mode='r+')
+        self.t = np.load(os.path.join(self.path,'t.npy'),mmap_mode='r+')